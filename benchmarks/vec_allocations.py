@@ -0,0 +1,119 @@
+"""
+Measures Vec3 allocations and memory during ray-marching.
+
+Run from the repository root:
+
+    python -m benchmarks.vec_allocations
+"""
+import time
+import tracemalloc
+
+from src.vec import Vec3
+from src.objects import *
+
+
+def create_scene():
+    return Union([
+        Sphere(1).translate((x * 3, y * 3, 0))
+        for x in range(-2, 3)
+        for y in range(-2, 3)
+    ] + [
+        Scale(2., Sphere(1)).translate((0, 0, 8)),
+    ])
+
+
+def create_rays(num: int):
+    rays = []
+    for i in range(num):
+        x, y = (i % 20) / 10. - 1., (i // 20 % 20) / 10. - 1.
+        rays.append((Vec3(0, 0, -10), Vec3(x, y, 1).normalize()))
+    return rays
+
+
+MAX_DISTANCE = 100.
+
+
+def march_with_temporaries(scene, origin: Vec3, direction: Vec3, max_iter: int = 1000):
+    """
+    The marching loop with operators, as it was before ``Vec3.add_scaled``
+    """
+    pos = origin.copy()
+    t = 0.
+    for it in range(max_iter):
+        d, o = scene.distance_object(pos)
+        if d <= 0.0001:
+            return pos, o
+        t += d
+        if t > MAX_DISTANCE:
+            break
+        pos += d * direction
+    return pos, None
+
+
+def count_vec3(func):
+    """
+    Returns the number of Vec3 instances created by ``func()``
+    """
+    counter = [0]
+    init = Vec3.__init__
+    from_floats = Vec3.__dict__["_from_floats"]
+
+    def counting_init(self, *args, **kwargs):
+        counter[0] += 1
+        init(self, *args, **kwargs)
+
+    def counting_from_floats(cls, *args):
+        counter[0] += 1
+        return from_floats.__func__(cls, *args)
+
+    Vec3.__init__ = counting_init
+    Vec3._from_floats = classmethod(counting_from_floats)
+    try:
+        func()
+    finally:
+        Vec3.__init__ = init
+        Vec3._from_floats = from_floats
+    return counter[0]
+
+
+def measure_memory(func):
+    """
+    Returns the peak traced memory of ``func()`` in bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    scene = create_scene()
+    rays = create_rays(400)
+
+    def march_fused():
+        for origin, direction in rays:
+            scene.raymarch(origin, direction, max_distance=MAX_DISTANCE)
+
+    def march_temporaries():
+        for origin, direction in rays:
+            march_with_temporaries(scene, origin, direction)
+
+    for name, func in (("fused", march_fused), ("temporaries", march_temporaries)):
+        start = time.time()
+        func()
+        seconds = time.time() - start
+        num_vec3 = count_vec3(func)
+        print(
+            f"{name:12}: {num_vec3 / len(rays):8.2f} Vec3/ray"
+            f", {seconds / len(rays) * 1000:6.3f} ms/ray"
+        )
+
+    vectors = []
+    size = measure_memory(lambda: vectors.extend(Vec3(i, i, i) for i in range(100000)))
+    print(f"Vec3 size   : {size / len(vectors):8.2f} bytes (including list and floats)")
+
+
+if __name__ == "__main__":
+    main()
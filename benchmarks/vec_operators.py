@@ -0,0 +1,35 @@
+"""
+Times the Vec3 operators.
+
+Run from the repository root:
+
+    python -m benchmarks.vec_operators
+"""
+import timeit
+
+from src.vec import Vec3
+
+
+STATEMENTS = {
+    "a + b": "a + b",
+    "a.add_vec(b)": "a.add_vec(b)",
+    "a * 2.": "a * 2.",
+    "a.mul_scalar(2.)": "a.mul_scalar(2.)",
+    "2. * a": "2. * a",
+    "-a": "-a",
+    "a + (1, 2, 3)": "a + (1, 2, 3)",
+    "a.copy()": "a.copy()",
+    "a + b * 2.": "a + b * 2.",
+    "a.madd(b, 2.)": "a.madd(b, 2.)",
+}
+
+
+def main(number: int = 200000):
+    namespace = {"a": Vec3(1, 2, 3), "b": Vec3(4, 5, 6)}
+    for name, statement in STATEMENTS.items():
+        seconds = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+        print(f"{name:16}: {seconds / number * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
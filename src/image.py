@@ -1,24 +1,84 @@
-from typing import Union, TextIO, Callable
+import operator
+import struct
+import sys
+import zlib
+from array import array
+from multiprocessing import shared_memory
+from typing import Union, TextIO, BinaryIO, Callable, Iterable
 from .vec import Vec3
 
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
 class Image:
     """
     A Portable Bitmap / Netpbm image writer
 
     https://en.wikipedia.org/wiki/Netpbm
+
+    The pixels are stored in ``pixels``, a flat ``array('d')`` of
+    red, green and blue values, row by row. ``data`` provides a
+    list-like view of rows of Vec3 for compatibility.
     """
 
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.data = [
-            [
-                Vec3()
-                for x in range(self.width)
-            ]
-            for y in range(self.height)
-        ]
+        self.pixels = array("d", bytes(8 * 3 * width * height))
+
+    @property
+    def data(self) -> "ImageRows":
+        """
+        Rows of pixels, e.g. ``image.data[y][x] += color``
+        """
+        return ImageRows(self)
+
+    def pixel(self, x: int, y: int) -> Vec3:
+        i = (y * self.width + x) * 3
+        return Vec3(self.pixels[i], self.pixels[i + 1], self.pixels[i + 2])
+
+    def set_pixel(self, x: int, y: int, color: Iterable[float]):
+        i = (y * self.width + x) * 3
+        self.pixels[i], self.pixels[i + 1], self.pixels[i + 2] = color
+
+    def add_pixel(self, x: int, y: int, color: Iterable[float]):
+        i = (y * self.width + x) * 3
+        r, g, b = color
+        pixels = self.pixels
+        pixels[i] += r
+        pixels[i + 1] += g
+        pixels[i + 2] += b
+
+    def row(self, y: int) -> array:
+        """
+        Returns a copy of the flat r, g, b values of row ``y``
+        """
+        return self.pixels[y * self.width * 3:(y + 1) * self.width * 3]
+
+    def add_tile(self, x0: int, y0: int, tile: "Image"):
+        """
+        Add the pixels of ``tile`` at position ``x0``, ``y0``
+        """
+        pixels = self.pixels
+        for y in range(tile.height):
+            start = ((y0 + y) * self.width + x0) * 3
+            end = start + tile.width * 3
+            pixels[start:end] = array("d", map(operator.add, pixels[start:end], tile.row(y)))
+
+    def map(self, func: Callable):
+        """
+        Replace each pixel by ``func(Vec3)``
+        """
+        pixels = self.pixels
+        for i in range(0, len(pixels), 3):
+            pixels[i], pixels[i + 1], pixels[i + 2] = func(Vec3(pixels[i], pixels[i + 1], pixels[i + 2]))
+
+    def scale(self, factor: float):
+        """
+        Multiply all pixels by ``factor``
+        """
+        self.pixels[:] = array("d", [v * factor for v in self.pixels])
 
     def write_bitmap(self, file_or_name: Union[TextIO, str], threshold: float = 0.5):
         """
@@ -26,33 +86,87 @@ class Image:
         """
         if isinstance(file_or_name, str):
             with open(file_or_name, "w") as file:
-                self.write_bitmap(file)
+                self.write_bitmap(file, threshold)
         else:
-            print("P1", file=file_or_name)
-            print(self.width, self.height, file=file_or_name)
-            for row in self.data:
-                row = [
-                    0 if c[0] >= threshold or c[1] >= threshold or c[2] >= threshold else 1
-                    for c in row
-                ]
-                print(*row, file=file_or_name)
+            file_or_name.write(f"P1\n{self.width} {self.height}\n")
+            for y in range(self.height):
+                values = self.row(y)
+                file_or_name.write(" ".join(
+                    "0" if values[i] >= threshold or values[i + 1] >= threshold or values[i + 2] >= threshold
+                    else "1"
+                    for i in range(0, len(values), 3)
+                ) + "\n")
 
     def write_pixmap(self, file_or_name: Union[TextIO, str]):
         """
-        Write a colored Pixmap
+        Write a colored Pixmap (ASCII)
         """
         if isinstance(file_or_name, str):
             with open(file_or_name, "w") as file:
                 self.write_pixmap(file)
         else:
-            print("P3", file=file_or_name)
-            print(self.width, self.height, file=file_or_name)
-            print(255, file=file_or_name)
-            for row in self.data:
-                for c in row:
-                    c = [max(0, min(255, int(v * 255))) for v in c]
-                    print(*c, end=" ", file=file_or_name)
-                print(file=file_or_name)
+            file_or_name.write(f"P3\n{self.width} {self.height}\n255\n")
+            for y in range(self.height):
+                file_or_name.write(" ".join(map(str, self.row_bytes(y))) + "\n")
+
+    def write_ppm(self, file_or_name: Union[BinaryIO, str]):
+        """
+        Write a binary colored Pixmap (P6)
+        """
+        if isinstance(file_or_name, str):
+            with open(file_or_name, "wb") as file:
+                self.write_ppm(file)
+        else:
+            file_or_name.write(f"P6\n{self.width} {self.height}\n255\n".encode("ascii"))
+            for y in range(self.height):
+                file_or_name.write(self.row_bytes(y))
+
+    def write_pfm(self, file_or_name: Union[BinaryIO, str]):
+        """
+        Write a Portable Float Map with 32 bit floats, rows are stored bottom to top
+
+        https://www.pauldebevec.com/Research/HDR/PFM/
+        """
+        if isinstance(file_or_name, str):
+            with open(file_or_name, "wb") as file:
+                self.write_pfm(file)
+        else:
+            # a negative scale means little-endian
+            scale = -1. if sys.byteorder == "little" else 1.
+            file_or_name.write(f"PF\n{self.width} {self.height}\n{scale}\n".encode("ascii"))
+            for y in reversed(range(self.height)):
+                file_or_name.write(array("f", self.row(y)).tobytes())
+
+    def write_png(self, file_or_name: Union[BinaryIO, str], compression: int = 6):
+        """
+        Write a 8 bit RGB PNG
+
+        :param compression: zlib compression level, 0 - 9
+        """
+        if isinstance(file_or_name, str):
+            with open(file_or_name, "wb") as file:
+                self.write_png(file, compression)
+        else:
+            compressor = zlib.compressobj(compression)
+            data = []
+            for y in range(self.height):
+                # filter type 0 (None) for each scanline
+                data.append(compressor.compress(b"\x00" + self.row_bytes(y)))
+            data.append(compressor.flush())
+
+            file_or_name.write(PNG_SIGNATURE)
+            file_or_name.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)))
+            file_or_name.write(png_chunk(b"IDAT", b"".join(data)))
+            file_or_name.write(png_chunk(b"IEND", b""))
+
+    def row_bytes(self, y: int) -> bytes:
+        """
+        Returns the r, g, b values of row ``y`` quantized to bytes in range [0, 255]
+        """
+        return bytes([
+            0 if v <= 0. else 255 if v >= 1. else int(v * 255)
+            for v in self.row(y)
+        ])
 
     def dump(self, file: TextIO = None):
         for row in self.data:
@@ -66,7 +180,234 @@ class Image:
             ]
             print("".join(row), file=file)
 
-    def map(self, func: Callable):
+    def dump_bw(self, file: TextIO = None, black: str = " ", white: str = "█", threshold: float = 0.5):
+        """
+        Print the image with two characters per pixel.
+
+        A pixel is white if any channel is at least ``threshold``.
+        """
         for row in self.data:
-            for i, col in enumerate(row):
-                row[i] = func(col)
+            print(
+                "".join(
+                    (white if c[0] >= threshold or c[1] >= threshold or c[2] >= threshold else black) * 2
+                    for c in row
+                ),
+                file=file,
+            )
+
+
+class SharedImage(Image):
+    """
+    An Image whose pixels live in ``multiprocessing.shared_memory``.
+
+    Render worker processes add their tiles directly into the shared buffer
+    instead of sending them back to the parent. The creating instance owns
+    the memory and frees it in ``close``, other processes can attach
+    with the ``name`` (pickling does that automatically).
+    """
+
+    def __init__(self, width: int, height: int, name: str = None):
+        self.width = width
+        self.height = height
+        size = 8 * 3 * width * height
+        if name is None:
+            # new shared memory is zero-filled
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=max(1, size))
+        else:
+            self.shared_memory = shared_memory.SharedMemory(name=name)
+        self.owner = name is None
+        # the buffer may be larger than requested
+        self.pixels = self.shared_memory.buf[:size].cast("d")
+
+    @property
+    def name(self) -> str:
+        return self.shared_memory.name
+
+    def __getstate__(self):
+        return {"width": self.width, "height": self.height, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["width"], state["height"], name=state["name"])
+
+    def row(self, y: int) -> array:
+        values = array("d")
+        values.frombytes(self.pixels[y * self.width * 3:(y + 1) * self.width * 3].tobytes())
+        return values
+
+    def close(self):
+        """
+        Detach from the shared memory and free it, if this instance created it
+        """
+        if self.pixels is None:
+            return
+        self.pixels.release()
+        self.pixels = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ImageRows:
+    """
+    List-like view of the rows of an Image
+    """
+
+    def __init__(self, image: Image):
+        self.image = image
+
+    def __len__(self):
+        return self.image.height
+
+    def __getitem__(self, y: int) -> "ImageRow":
+        if y < 0:
+            y += self.image.height
+        if not 0 <= y < self.image.height:
+            raise IndexError(f"row {y} out of range")
+        return ImageRow(self.image, y)
+
+    def __iter__(self):
+        for y in range(self.image.height):
+            yield ImageRow(self.image, y)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class ImageRow:
+    """
+    List-like view of one row of an Image.
+
+    Pixels are returned as Vec3 copies, assignment writes them back,
+    so ``row[x] += color`` works like with a list.
+    """
+
+    def __init__(self, image: Image, y: int):
+        self.image = image
+        self.y = y
+
+    def __len__(self):
+        return self.image.width
+
+    def _index(self, x: int) -> int:
+        if x < 0:
+            x += self.image.width
+        if not 0 <= x < self.image.width:
+            raise IndexError(f"pixel {x} out of range")
+        return x
+
+    def __getitem__(self, x: int) -> Vec3:
+        return self.image.pixel(self._index(x), self.y)
+
+    def __setitem__(self, x: int, color: Iterable[float]):
+        self.image.set_pixel(self._index(x), self.y, color)
+
+    def __iter__(self):
+        values = self.image.row(self.y)
+        for i in range(0, len(values), 3):
+            yield Vec3(values[i], values[i + 1], values[i + 2])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class ImageSink:
+    """
+    Base class for streaming targets of ``Raymarcher.render``.
+
+    Instead of keeping the whole image in memory, the renderer passes
+    bands of finished rows to ``write_rows`` from top to bottom.
+    Sinks are context managers, ``close`` must be called when done.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    def write_rows(self, y: int, rows: Image):
+        """
+        Write the rows of ``rows`` (an Image of the same width) starting at row ``y``
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PPMSink(ImageSink):
+    """
+    Streams a binary Pixmap (P6) to a file.
+
+    The file is allocated with it's full size (black) on creation and each band
+    is written at it's offset, so an interrupted render leaves a valid image.
+    """
+
+    def __init__(self, filename: str, width: int, height: int):
+        super().__init__(width, height)
+        self.file = open(filename, "w+b")
+        header = f"P6\n{width} {height}\n255\n".encode("ascii")
+        self.file.write(header)
+        self.offset = len(header)
+        self.file.truncate(self.offset + width * height * 3)
+
+    def write_rows(self, y: int, rows: Image):
+        self.file.seek(self.offset + y * self.width * 3)
+        self.file.write(b"".join(rows.row_bytes(i) for i in range(rows.height)))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class PNGSink(ImageSink):
+    """
+    Streams a 8 bit RGB PNG to a file.
+
+    Each band is compressed with a ``Z_SYNC_FLUSH`` and written as one IDAT chunk,
+    so the rows written so far can be decoded after an interrupted render.
+    Rows must be written in order.
+    """
+
+    def __init__(self, filename: str, width: int, height: int, compression: int = 6):
+        super().__init__(width, height)
+        self.file = open(filename, "wb")
+        self.file.write(PNG_SIGNATURE)
+        self.file.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        self.compressor = zlib.compressobj(compression)
+        self.next_row = 0
+
+    def write_rows(self, y: int, rows: Image):
+        if y != self.next_row:
+            raise ValueError(f"Expected row {self.next_row}, got {y}")
+        data = self.compressor.compress(
+            b"".join(b"\x00" + rows.row_bytes(i) for i in range(rows.height))
+        )
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.file.write(png_chunk(b"IDAT", data))
+        self.file.flush()
+        self.next_row += rows.height
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write(png_chunk(b"IDAT", self.compressor.flush()))
+        self.file.write(png_chunk(b"IEND", b""))
+        self.file.close()
+
+
+ImageTarget = Union[Image, ImageSink]
+
+
+def png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
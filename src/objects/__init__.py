@@ -1,10 +1,12 @@
 from .base import Base
-from .combine import Union, Difference, Intersection
+from .combine import Union, AcceleratedUnion, Difference, Intersection
+from .compiler import compile_scene, CompiledScene
 from .material import (
     Material, Color, Checker
 )
 from .primitives import (
     Sphere, Tube, Plane
 )
-from .transform import Translate, Scale
+from .optimize import fold_transforms
+from .transform import Translate, Scale, Affine
 from .treenode import TreeNode
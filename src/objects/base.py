@@ -1,12 +1,96 @@
+import math
+
 from .param_space import ParameterizedSpaceNode
+from . import vectorized
+from .node_table import NodeTable
+from .bounds import Bounds, INFINITY
 from ..vec.types import *
-from ..vec import Vec3
+from ..vec import Vec3, Vec3Array
+
 
+class Base(ParameterizedSpaceNode):
 
-INFINITY = 1.e20
+    _bounds = None
+    _compiled = None
+    _node_table = None
 
+    # ----- bounding volume -----
 
-class Base(ParameterizedSpaceNode):
+    def bounds(self) -> Bounds:
+        """
+        Returns the axis-aligned bounding box of this object in it's outside coordinates.
+
+        The value is cached, call ``invalidate_bounds`` when parameters are changed in place.
+
+        :return: Bounds
+        """
+        if self._bounds is None:
+            self._bounds = self.calc_bounds()
+        return self._bounds
+
+    def calc_bounds(self) -> Bounds:
+        """
+        Override to calculate the bounding box, default is infinite.
+
+        The distance to the box must be a lower bound of the ``distance`` of this object.
+        """
+        return Bounds.infinite()
+
+    def invalidate_bounds(self):
+        """
+        Clears the cached bounds and compiled form of this object and all parents,
+        and the cached global transforms
+        """
+        self.invalidate_transforms()
+        self._bounds = None
+        self._compiled = None
+        self._node_table = None
+        if isinstance(self.node_parent, Base):
+            self.node_parent.invalidate_bounds()
+
+    def on_parameter_changed(self, name: str):
+        super().on_parameter_changed(name)
+        self.invalidate_bounds()
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.invalidate_bounds()
+
+    def remove_node(self, node):
+        super().remove_node(node)
+        self.invalidate_bounds()
+
+    # ----- node IDs -----
+
+    def node_table(self) -> NodeTable:
+        """
+        Returns the cached ``NodeTable`` of this object and it's children,
+        which maps node IDs to nodes and materials.
+        """
+        if self._node_table is None:
+            self._node_table = NodeTable(self)
+        return self._node_table
+
+    @property
+    def node_id(self) -> int:
+        """
+        The dense integer ID of this node in it's scene,
+        the index in the root's ``node_table``.
+
+        ``1 << node_id`` can be passed as ``ignore_objects`` to the
+        ray-marching methods of any node of the scene.
+        IDs change when nodes are added or removed.
+        """
+        return self.node_root.node_table().index(self)
+
+    def _ignore_set(self, ignore_objects):
+        """
+        Returns ``ignore_objects`` as collection of nodes, an int is a bitmask
+        of node IDs, the indices in the root's ``node_table``, see ``node_id``.
+        """
+        if isinstance(ignore_objects, int):
+            return self.node_root.node_table().nodes_of_mask(ignore_objects) or None
+        return ignore_objects
 
     # ----- ray-marching -----
 
@@ -16,12 +100,89 @@ class Base(ParameterizedSpaceNode):
     def distance_object(self, pos: Vec3, ignore_objects=None):
         raise NotImplementedError
 
-    def normal(self, pos: Vec3, e: float = 0.001):
+    def distance_object_array(self, points, table, ignore_objects=None):
+        """
+        Vectorized ``distance_object`` for many points, requires numpy.
+
+        The default implementation calls ``distance_object`` for each point,
+        derived classes should override it with array operations.
+
+        :param points: numpy array of shape (N, 3)
+        :param table: an ``ObjectTable`` which maps the returned objects to indices
+        :return: tuple of numpy arrays (distances, object_indices)
+        """
+        distances, indices = vectorized.empty_result(len(points))
+        for i, point in enumerate(points):
+            d, o = self.distance_object(Vec3(point), ignore_objects=ignore_objects)
+            distances[i] = d
+            indices[i] = table.index(o)
+        return distances, indices
+
+    def compiled(self):
+        """
+        Returns the cached ``CompiledScene`` of this object and it's children.
+
+        Call ``invalidate_bounds`` when parameters are changed in place.
+        """
+        if self._compiled is None:
+            from .compiler import compile_scene
+            self._compiled = compile_scene(self)
+        return self._compiled
+
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        """
+        Returns the distance and the gradient of the distance field at ``pos``.
+
+        The default implementation estimates the gradient from four
+        ``distance`` evaluations, see ``normal``. Primitives and
+        transforms override it with the analytic gradient, combinations pass
+        on the gradient of the deciding child, so the whole tree is walked once.
+
+        :param pos: Vec3 position
+        :param e: offset for the numerical estimation
+        :return: tuple of (distance, Vec3)
+        """
+        d = self.distance(pos)
+        return d, self._tetrahedral_gradient(pos, e).idiv_scalar(4. * e)
+
+    def gradient(self, pos: Vec3, e: float = 0.0001):
+        return self.distance_gradient(pos, e)[1]
+
+    def normal(self, pos: Vec3, e: float = 0.0001, compiled: bool = False, analytic: bool = False):
+        """
+        Returns the surface normal at ``pos``.
+
+        :param pos: Vec3 position
+        :param e: offset for the numerical estimation
+        :param compiled: evaluate the distances with the ``CompiledScene``
+        :param analytic: use ``distance_gradient`` instead of the numerical estimation
+        :return: normalized Vec3
+        """
+        if analytic:
+            return self.distance_gradient(pos, e)[1].normalize_safe()
+
+        if compiled:
+            return self.compiled().normal(pos, e)
+
+        return self._tetrahedral_gradient(pos, e).normalize_safe()
+
+    def _tetrahedral_gradient(self, pos: Vec3, e: float):
+        """
+        Gradient estimate from the four corners of a tetrahedron,
+        which needs four instead of six ``distance`` evaluations.
+
+        The result is scaled by ``4 * e``.
+        """
+        x, y, z = pos
+        d1 = self.distance(Vec3(x + e, y - e, z - e))
+        d2 = self.distance(Vec3(x - e, y - e, z + e))
+        d3 = self.distance(Vec3(x - e, y + e, z - e))
+        d4 = self.distance(Vec3(x + e, y + e, z + e))
         return Vec3(
-            self.distance(pos + (e, 0, 0)) - self.distance(pos - (e, 0, 0)),
-            self.distance(pos + (0, e, 0)) - self.distance(pos - (0, e, 0)),
-            self.distance(pos + (0, 0, e)) - self.distance(pos - (0, 0, e)),
-        ).normalize_safe()
+            d1 - d2 - d3 + d4,
+            -d1 - d2 + d3 + d4,
+            -d1 + d2 - d3 + d4,
+        )
 
     def raymarch(
             self,
@@ -29,19 +190,217 @@ class Base(ParameterizedSpaceNode):
             direction: Vec3,
             max_iter: int = 1000,
             ignore_objects = None,
+            compiled: bool = False,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
     ):
+        """
+        March a ray until it hits a surface.
+
+        A surface is hit if the distance is below ``epsilon + t * cone_angle``,
+        where ``t`` is the distance travelled so far. With the cone angle
+        of a pixel, distant surfaces are resolved to about pixel precision
+        instead of a fixed ``epsilon``.
+
+        :param origin: Vec3 start position
+        :param direction: normalized Vec3
+        :param max_iter: maximum number of steps
+        :param ignore_objects: optional set of objects to ignore, or an int bitmask
+            of their ``node_id``. Secondary rays should rather start slightly off the surface,
+            ignoring objects makes each step slower
+        :param compiled: use the ``CompiledScene``
+        :param omega: over-relaxation factor for the step size, see ``_raymarch_relaxed``
+        :param epsilon: hit threshold at the origin
+        :param cone_angle: increase of the hit threshold per distance travelled
+        :param max_distance: rays that travel further are stopped without a hit
+        :return: tuple of (position, object), object is None if nothing was hit
+        """
+        if compiled:
+            return self.compiled().raymarch(
+                origin, direction, max_iter, ignore_objects,
+                omega=omega, epsilon=epsilon, cone_angle=cone_angle, max_distance=max_distance,
+            )
+
+        ignore_objects = self._ignore_set(ignore_objects)
+        if omega > 1.:
+            return self._raymarch_relaxed(
+                origin, direction, max_iter, ignore_objects, omega, epsilon, cone_angle, max_distance,
+            )[:2]
+
         pos = origin.copy()
+        t = 0.
         for it in range(max_iter):
 
             d, o = self.distance_object(pos, ignore_objects=ignore_objects)
 
-            if d <= 0.0001:
+            if d <= epsilon + t * cone_angle:
                 return pos, o
 
-            pos += d * direction
+            t += d
+            if t > max_distance:
+                break
+
+            pos.add_scaled(direction, d)
 
         return pos, None
 
+    def _raymarch_relaxed(
+            self,
+            origin: Vec3,
+            direction: Vec3,
+            max_iter: int,
+            ignore_objects,
+            omega: float,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        """
+        Over-relaxed sphere tracing, see Keinert et al., "Enhanced Sphere Tracing".
+
+        Steps are enlarged by ``omega``, typically 1.2 - 1.6. If the distance
+        spheres of two consecutive steps do not overlap, a surface might have
+        been skipped. The ray then goes back to the normal step length
+        and continues without over-relaxation.
+
+        :return: tuple of (position, object, iterations)
+        """
+        pos = origin.copy()
+        t = 0.
+        step = 0.
+        prev_radius = 0.
+        for it in range(max_iter):
+
+            d, o = self.distance_object(pos, ignore_objects=ignore_objects)
+            radius = abs(d)
+
+            if omega > 1. and radius + prev_radius < step:
+                t -= step - prev_radius
+                pos.add_scaled(direction, prev_radius - step)
+                omega = 1.
+                continue
+
+            if radius <= epsilon + t * cone_angle:
+                return pos, o, it + 1
+
+            step = d * omega
+            prev_radius = radius
+            t += step
+            if t > max_distance:
+                return pos, None, it + 1
+
+            pos.add_scaled(direction, step)
+
+        return pos, None, max_iter
+
+    def raymarch_many(
+            self,
+            origins: Sequence[Vec3],
+            directions: Sequence[Vec3],
+            max_iter: int = 1000,
+            ignore_objects=None,
+            vectorized: bool = False,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        """
+        March a packet of rays together.
+
+        All rays are advanced one step per iteration and rays that hit
+        an object are removed from the active set. The steps are the same
+        as in ``raymarch``, so the results are identical.
+
+        :param origins: sequence of Vec3
+        :param directions: sequence of Vec3, same length as ``origins``
+        :param max_iter: maximum number of steps per ray
+        :param ignore_objects: optional set of objects to ignore for all rays,
+            or an int bitmask of their ``node_id``
+        :param vectorized: march all rays with array operations, requires numpy
+        :param omega: over-relaxation factor, if > 1 each ray is marched
+            separately with ``_raymarch_relaxed``
+        :param epsilon: hit threshold at the origin, see ``raymarch``
+        :param cone_angle: increase of the hit threshold per distance travelled
+        :param max_distance: rays that travel further are stopped without a hit
+        :return: tuple of lists (positions, objects, iterations),
+            where iterations is the number of distance evaluations per ray.
+            With ``vectorized``, positions is a ``Vec3Array``
+        """
+        ignore_objects = self._ignore_set(ignore_objects)
+        if vectorized:
+            return self._raymarch_many_vectorized(
+                origins, directions, max_iter, ignore_objects, epsilon, cone_angle, max_distance,
+            )
+
+        if omega > 1.:
+            results = [
+                self._raymarch_relaxed(
+                    origin, direction, max_iter, ignore_objects, omega, epsilon, cone_angle, max_distance,
+                )
+                for origin, direction in zip(origins, directions)
+            ]
+            return [r[0] for r in results], [r[1] for r in results], [r[2] for r in results]
+
+        positions = [origin.copy() for origin in origins]
+        # index once, e.g. if a Vec3Array is passed
+        directions = list(directions)
+        travelled = [0.] * len(positions)
+        objects = [None] * len(positions)
+        iterations = [max_iter] * len(positions)
+
+        active = list(range(len(positions)))
+        for it in range(max_iter):
+            if not active:
+                break
+
+            still_active = []
+            for i in active:
+                pos = positions[i]
+                d, o = self.distance_object(pos, ignore_objects=ignore_objects)
+                t = travelled[i]
+
+                if d <= epsilon + t * cone_angle:
+                    objects[i] = o
+                    iterations[i] = it + 1
+                    continue
+
+                t += d
+                if t > max_distance:
+                    iterations[i] = it + 1
+                    continue
+
+                travelled[i] = t
+                pos.add_scaled(directions[i], d)
+                still_active.append(i)
+
+            active = still_active
+
+        return positions, objects, iterations
+
+    def _raymarch_many_vectorized(
+            self,
+            origins: Sequence[Vec3],
+            directions: Sequence[Vec3],
+            max_iter: int,
+            ignore_objects,
+            epsilon: float,
+            cone_angle: float,
+            max_distance: float,
+    ):
+        positions, indices, iterations, table = vectorized.raymarch_array(
+            self, vectorized.to_array(origins), vectorized.to_array(directions),
+            max_iter=max_iter, ignore_objects=ignore_objects,
+            epsilon=epsilon, cone_angle=cone_angle, max_distance=max_distance,
+        )
+        return (
+            Vec3Array.from_numpy(positions),
+            [table[i] for i in indices.tolist()],
+            iterations.tolist(),
+        )
+
     # ---- deformations ----
 
     def translate(self, translation: Vector3):
@@ -69,3 +428,17 @@ class Base(ParameterizedSpaceNode):
             object=self,
             scale=float(scale),
         )
+
+    def rotate(self, axis: Vector3, degree: float):
+        """
+        Returns a rotated object.
+
+        :param axis: a float sequence of length 3
+        :param degree: the degrees [0., 360.]
+        :return: an ``Affine`` object
+        """
+        from .transform import Affine
+        return Affine(
+            object=self,
+            matrix=Affine.rotation_matrix(axis, degree),
+        )
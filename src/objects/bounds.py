@@ -0,0 +1,109 @@
+import math
+
+from ..vec import Vec3
+from ..vec.types import *
+
+
+INFINITY = 1.e20
+
+BOUNDS_SAFETY = 1. - 1.e-9
+
+
+class Bounds:
+    """
+    An axis-aligned bounding box.
+
+    Components may be +/- ``math.inf`` for unbounded objects.
+    """
+
+    def __init__(self, min: Vector3, max: Vector3):
+        self.min = Vec3(min)
+        self.max = Vec3(max)
+
+    @classmethod
+    def infinite(cls):
+        return cls((-math.inf, -math.inf, -math.inf), (math.inf, math.inf, math.inf))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.min}, {self.max})"
+
+    def __eq__(self, other):
+        return isinstance(other, Bounds) and self.min == other.min and self.max == other.max
+
+    @property
+    def is_infinite(self) -> bool:
+        return min(self.min) == -math.inf or max(self.max) == math.inf
+
+    @property
+    def volume(self) -> float:
+        return (
+            min(INFINITY, self.max.x - self.min.x)
+            * min(INFINITY, self.max.y - self.min.y)
+            * min(INFINITY, self.max.z - self.min.z)
+        )
+
+    def distance(self, pos: Vec3) -> float:
+        """
+        Returns the distance of ``pos`` to the box, which is a lower bound
+        of the distance to any surface inside the box.
+
+        Inside the box, the surfaces can be arbitrarily close,
+        so ``-INFINITY`` is returned.
+
+        The value is shrunk by a tiny fraction, so that rounding errors
+        never make it larger than the distance of a contained surface.
+
+        >>> round(Bounds((-1, -1, -1), (1, 1, 1)).distance(Vec3(4, 5, 0)), 6)
+        5.0
+        >>> Bounds((-1, -1, -1), (1, 1, 1)).distance(Vec3(0, .5, 0))
+        -1e+20
+        """
+        dx = max(self.min.x - pos.x, 0., pos.x - self.max.x)
+        dy = max(self.min.y - pos.y, 0., pos.y - self.max.y)
+        dz = max(self.min.z - pos.z, 0., pos.z - self.max.z)
+        if not (dx or dy or dz):
+            return -INFINITY
+        return math.sqrt(dx * dx + dy * dy + dz * dz) * BOUNDS_SAFETY
+
+    def union(self, other: "Bounds") -> "Bounds":
+        return Bounds(
+            (min(self.min.x, other.min.x), min(self.min.y, other.min.y), min(self.min.z, other.min.z)),
+            (max(self.max.x, other.max.x), max(self.max.y, other.max.y), max(self.max.z, other.max.z)),
+        )
+
+    def translated(self, translation: Vector3) -> "Bounds":
+        return Bounds(
+            [v + t for v, t in zip(self.min, translation)],
+            [v + t for v, t in zip(self.max, translation)],
+        )
+
+    def scaled(self, scale: float) -> "Bounds":
+        mi = [v * scale for v in self.min]
+        ma = [v * scale for v in self.max]
+        if scale < 0:
+            mi, ma = ma, mi
+        return Bounds(mi, ma)
+
+    def transformed(self, matrix: Sequence[float], translation: Vector3) -> "Bounds":
+        """
+        Returns the box around the 8 corners multiplied by
+        the row-major 3x3 ``matrix`` and translated
+
+        >>> Bounds((0, 0, 0), (1, 2, 3)).transformed((0, -1, 0, 1, 0, 0, 0, 0, 1), (1, 0, 0))
+        Bounds(Vec3(-1, 0, 0), Vec3(1, 1, 3))
+        """
+        if self.is_infinite:
+            return Bounds.infinite()
+        # per row, the smallest and largest sum of matrix element times min or max
+        mi, ma = [], []
+        for row in range(3):
+            lo = hi = translation[row]
+            for col in range(3):
+                m = matrix[row * 3 + col]
+                a, b = m * self.min[col], m * self.max[col]
+                lo += min(a, b)
+                hi += max(a, b)
+            mi.append(lo)
+            ma.append(hi)
+        return Bounds(mi, ma)
+
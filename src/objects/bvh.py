@@ -0,0 +1,77 @@
+from typing import Iterable, Optional
+
+from .bounds import Bounds
+
+
+class BVHNode:
+    """
+    A node of a bounding volume hierarchy.
+
+    Leaf nodes have ``items``, a list of tuples (index, object, Bounds),
+    inner nodes have ``left`` and ``right`` children.
+    """
+
+    def __init__(self, bounds: Bounds, items: list = None, left: "BVHNode" = None, right: "BVHNode" = None):
+        self.bounds = bounds
+        self.items = items
+        self.left = left
+        self.right = right
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.items is not None
+
+    def depth(self) -> int:
+        if self.is_leaf:
+            return 1
+        return 1 + max(self.left.depth(), self.right.depth())
+
+    def refit(self) -> Bounds:
+        """
+        Recalculate the bounds from the objects without changing the hierarchy
+        """
+        if self.is_leaf:
+            self.items = [(i, obj, obj.bounds()) for i, obj, _ in self.items]
+            self.bounds = _union_bounds(b for _, _, b in self.items)
+        else:
+            self.bounds = self.left.refit().union(self.right.refit())
+        return self.bounds
+
+
+def build_bvh(items: list, max_leaf_size: int = 2) -> Optional[BVHNode]:
+    """
+    Build a hierarchy by splitting the items at the median
+    of the longest axis of their box centers.
+
+    :param items: list of tuples (index, object, Bounds) with finite bounds
+    :param max_leaf_size: maximum number of items in a leaf
+    :return: BVHNode or None if ``items`` is empty
+    """
+    if not items:
+        return None
+
+    bounds = _union_bounds(b for _, _, b in items)
+    if len(items) <= max_leaf_size:
+        return BVHNode(bounds, items=list(items))
+
+    centers = [b.min.add_vec(b.max).imul_scalar(.5) for _, _, b in items]
+    extent = [
+        max(c[axis] for c in centers) - min(c[axis] for c in centers)
+        for axis in range(3)
+    ]
+    axis = extent.index(max(extent))
+
+    order = sorted(range(len(items)), key=lambda i: centers[i][axis])
+    half = len(items) // 2
+    return BVHNode(
+        bounds,
+        left=build_bvh([items[i] for i in order[:half]], max_leaf_size),
+        right=build_bvh([items[i] for i in order[half:]], max_leaf_size),
+    )
+
+
+def _union_bounds(bounds: Iterable[Bounds]) -> Bounds:
+    result = None
+    for b in bounds:
+        result = b if result is None else result.union(b)
+    return result
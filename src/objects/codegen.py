@@ -0,0 +1,340 @@
+"""
+Generates a specialized python module for a scene.
+
+The opcodes of a ``CompiledScene`` are unrolled into straight-line code
+with all parameters as constants, which is much easier for PyPy's JIT
+than the polymorphic tree walk. The generated modules are cached on disk
+under a hash of the program, so repeated renders and worker processes
+can skip the generation.
+"""
+import hashlib
+import importlib.util
+import math
+import os
+import tempfile
+
+from .base import Base, INFINITY
+from .bounds import BOUNDS_SAFETY
+from .compiler import *
+from ..vec import Vec3
+
+
+# increase when the generated code changes, to invalidate the disk cache
+GENERATOR_VERSION = 6
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "symmetrical-disco", "scenes")
+
+INDENT = "    "
+
+_loaded_modules = {}
+
+
+def generate_scene(root: Base, cache_dir: str = None) -> "GeneratedScene":
+    """
+    Compile ``root`` and load (or generate) it's python module
+
+    :param root: the scene
+    :param cache_dir: directory for the generated modules, defaults to ``DEFAULT_CACHE_DIR``
+    :return: GeneratedScene
+    """
+    return GeneratedScene(root, cache_dir=cache_dir)
+
+
+class GeneratedScene(CompiledScene):
+    """
+    A ``CompiledScene`` which runs generated python code.
+
+    Queries with ``ignore_objects`` or over-relaxation fall back to the interpreter.
+    """
+
+    def __init__(self, root: Base, cache_dir: str = None):
+        super().__init__(root)
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.hash = program_hash(self)
+        self.module = load_module(self, self.cache_dir)
+
+    def _call(self, index: int, x: float, y: float, z: float):
+        d, o = self.objects[index].distance_object(Vec3(x, y, z))
+        return d, self.objects.index(o)
+
+    def _run(self, x: float, y: float, z: float, ignore: int = 0):
+        if ignore:
+            return super()._run(x, y, z, ignore)
+        return self.module.distance_object(x, y, z, self._call)
+
+    def _march(
+            self,
+            x, y, z, dx, dy, dz,
+            max_iter: int,
+            ignore: int = 0,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        if ignore or omega > 1.:
+            return super()._march(
+                x, y, z, dx, dy, dz, max_iter, ignore, omega, epsilon, cone_angle, max_distance,
+            )
+        return self.module.raymarch(
+            x, y, z, dx, dy, dz, max_iter, epsilon, cone_angle, max_distance, self._call,
+        )
+
+    def normal(self, pos: Vec3, e: float = 0.0001, analytic: bool = False):
+        if analytic:
+            return self.root.normal(pos, e, analytic=True)
+        return Vec3(self.module.normal(pos.x, pos.y, pos.z, e, self._call)).normalize_safe()
+
+
+def program_hash(scene: CompiledScene) -> str:
+    h = hashlib.sha1()
+    h.update(str(GENERATOR_VERSION).encode())
+    h.update(scene.code.tobytes())
+    h.update(scene.params.tobytes())
+    return h.hexdigest()
+
+
+def load_module(scene: CompiledScene, cache_dir: str):
+    """
+    Returns the module for the scene's program, generates the source if not cached
+    """
+    key = program_hash(scene)
+    module = _loaded_modules.get(key)
+    if module is not None:
+        return module
+
+    filename = os.path.join(cache_dir, f"scene_{key}.py")
+    if not os.path.exists(filename):
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, other processes might load the same scene
+        fd, tmp_filename = tempfile.mkstemp(suffix=".py", dir=cache_dir)
+        with os.fdopen(fd, "w") as fp:
+            fp.write(render_module(scene))
+        os.replace(tmp_filename, filename)
+
+    spec = importlib.util.spec_from_file_location(f"scene_{key}", filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    _loaded_modules[key] = module
+    return module
+
+
+def render_module(scene: CompiledScene) -> str:
+    """
+    Returns the python source for the scene's (unguarded) program
+    """
+    body, dist, obj = render_distance_body(scene.code, scene.params)
+
+    code = f"# autogenerated by {os.path.basename(__file__)}\n"
+    code += "from math import sqrt\n\n\n"
+
+    code += "def box_distance(x, y, z, x0, y0, z0, x1, y1, z1):\n"
+    code += f"{INDENT}dx = max(x0 - x, 0., x - x1)\n"
+    code += f"{INDENT}dy = max(y0 - y, 0., y - y1)\n"
+    code += f"{INDENT}dz = max(z0 - z, 0., z - z1)\n"
+    code += f"{INDENT}if not (dx or dy or dz):\n"
+    code += f"{INDENT*2}return {-INFINITY!r}\n"
+    code += f"{INDENT}return sqrt(dx * dx + dy * dy + dz * dz) * {BOUNDS_SAFETY!r}\n\n\n"
+
+    code += "def distance_object(x, y, z, call=None):\n"
+    code += "".join(f"{INDENT}{line}\n" for line in body)
+    code += f"{INDENT}return {dist}, {obj}\n\n\n"
+
+    code += "def distance(x, y, z, call=None):\n"
+    code += f"{INDENT}return distance_object(x, y, z, call)[0]\n\n\n"
+
+    code += "def normal(x, y, z, e, call=None):\n"
+    code += f"{INDENT}d1 = distance(x + e, y - e, z - e, call)\n"
+    code += f"{INDENT}d2 = distance(x - e, y - e, z + e, call)\n"
+    code += f"{INDENT}d3 = distance(x - e, y + e, z - e, call)\n"
+    code += f"{INDENT}d4 = distance(x + e, y + e, z + e, call)\n"
+    code += f"{INDENT}return d1 - d2 - d3 + d4, -d1 - d2 + d3 + d4, -d1 + d2 - d3 + d4\n\n\n"
+
+    code += "def raymarch(x, y, z, dx, dy, dz, max_iter, epsilon, cone, max_distance, call=None):\n"
+    code += f"{INDENT}t = 0.\n"
+    code += f"{INDENT}for it in range(max_iter):\n"
+    code += "".join(f"{INDENT*2}{line}\n" for line in body)
+    code += f"{INDENT*2}if {dist} <= epsilon + t * cone:\n"
+    code += f"{INDENT*3}return x, y, z, {obj}, it + 1\n"
+    code += f"{INDENT*2}t += {dist}\n"
+    code += f"{INDENT*2}if t > max_distance:\n"
+    code += f"{INDENT*3}return x, y, z, -1, it + 1\n"
+    code += f"{INDENT*2}x += {dist} * dx\n"
+    code += f"{INDENT*2}y += {dist} * dy\n"
+    code += f"{INDENT*2}z += {dist} * dz\n"
+    code += f"{INDENT}return x, y, z, -1, max_iter\n"
+
+    return code
+
+
+def render_distance_body(code, params):
+    """
+    Unroll the opcodes into a list of python statements.
+
+    The stack of the interpreter is replaced by numbered variables.
+    Object indices that are known at generation time are inlined as constants.
+
+    :return: tuple of (list of lines, distance variable, object expression)
+    """
+    lines = []
+    values = []  # tuples of (distance variable, object expression)
+    points = [("x", "y", "z")]
+    counter = {"d": 0, "p": 0}
+
+    def new_dist():
+        counter["d"] += 1
+        return f"d{counter['d']}"
+
+    def new_point():
+        counter["p"] += 1
+        n = counter["p"]
+        return f"x{n}", f"y{n}", f"z{n}"
+
+    def param(index):
+        return repr(params[index])
+
+    # open bounds guards as tuples of (jump address, first line, condition)
+    guards = []
+
+    def end_guard():
+        _, start, condition = guards.pop()
+        arg_d, arg_o = values.pop()
+        d = new_dist()
+        o = f"o{d[1:]}"
+        block = [f"{INDENT}{line}" for line in lines[start:]]
+        lines[start:] = [
+            f"if {condition}:",
+            f"{INDENT}{d}, {o} = {INFINITY!r}, -1",
+            "else:",
+            *block,
+            f"{INDENT}{d}, {o} = {arg_d}, {arg_o}",
+        ]
+        values.append((d, o))
+
+    pc = 0
+    while pc < len(code):
+        while guards and guards[-1][0] == pc:
+            end_guard()
+
+        op = code[pc]
+        x, y, z = points[-1]
+
+        if op == OP_SPHERE:
+            d = new_dist()
+            lines.append(f"{d} = sqrt({x} * {x} + {y} * {y} + {z} * {z}) - {param(code[pc + 2])}")
+            values.append((d, str(code[pc + 1])))
+
+        elif op == OP_TUBE:
+            d = new_dist()
+            terms = [f"{v} * {v}" for v in (x, y, z)]
+            terms[code[pc + 2]] = "0."
+            lines.append(f"{d} = sqrt({' + '.join(terms)}) - {param(code[pc + 3])}")
+            values.append((d, str(code[pc + 1])))
+
+        elif op == OP_PLANE:
+            d = new_dist()
+            p = code[pc + 2]
+            lines.append(f"{d} = {x} * {param(p)} + {y} * {param(p + 1)} + {z} * {param(p + 2)}")
+            values.append((d, str(code[pc + 1])))
+
+        elif op == OP_TRANSLATE:
+            p = code[pc + 1]
+            point = new_point()
+            lines.append(
+                f"{point[0]}, {point[1]}, {point[2]} = "
+                f"{x} - {param(p)}, {y} - {param(p + 1)}, {z} - {param(p + 2)}"
+            )
+            points.append(point)
+
+        elif op == OP_END_TRANSLATE:
+            points.pop()
+            values[-1] = (values[-1][0], str(code[pc + 1]))
+
+        elif op == OP_SCALE:
+            s = param(code[pc + 1])
+            point = new_point()
+            lines.append(f"{point[0]}, {point[1]}, {point[2]} = {x} / {s}, {y} / {s}, {z} / {s}")
+            points.append(point)
+
+        elif op == OP_END_SCALE:
+            points.pop()
+            d = new_dist()
+            lines.append(f"{d} = {values[-1][0]} * {param(code[pc + 2])}")
+            values[-1] = (d, str(code[pc + 1]))
+
+        elif op == OP_AFFINE:
+            p = code[pc + 1]
+            moved = new_point()
+            lines.append(
+                f"{moved[0]}, {moved[1]}, {moved[2]} = "
+                f"{x} - {param(p)}, {y} - {param(p + 1)}, {z} - {param(p + 2)}"
+            )
+            point = new_point()
+            rows = [
+                " + ".join(f"{param(p + 3 + row * 3 + col)} * {moved[col]}" for col in range(3))
+                for row in range(3)
+            ]
+            lines.append(f"{point[0]}, {point[1]}, {point[2]} = {', '.join(rows)}")
+            points.append(point)
+
+        elif op == OP_END_AFFINE:
+            points.pop()
+            d = new_dist()
+            lines.append(f"{d} = {values[-1][0]} * {param(code[pc + 2])}")
+            values[-1] = (d, str(code[pc + 1]))
+
+        elif op in (OP_UNION, OP_DIFFERENCE, OP_INTERSECTION):
+            num = code[pc + 1]
+            args = values[len(values) - num:] if num else []
+            del values[len(values) - len(args):]
+            d = new_dist()
+            o = f"o{d[1:]}"
+            lines.append(f"{d}, {o} = {INFINITY!r}, -1")
+            known_object = False
+            for i, (arg_d, arg_o) in enumerate(args):
+                if op == OP_UNION:
+                    lines.append(f"if {arg_d} < {d}: {d}, {o} = {arg_d}, {arg_o}")
+                else:
+                    sign = "-" if op == OP_DIFFERENCE else ""
+                    if i == 0 and arg_o.isdigit():
+                        # the first value with a constant object always replaces
+                        lines.append(f"{d}, {o} = {arg_d}, {arg_o}")
+                        known_object = True
+                    elif known_object:
+                        lines.append(f"if {sign}{arg_d} > {d}: {d}, {o} = {sign}{arg_d}, {arg_o}")
+                    else:
+                        # earlier values might not have set an object
+                        lines.append(f"if {o} < 0: {d}, {o} = {arg_d}, {arg_o}")
+                        lines.append(f"elif {sign}{arg_d} > {d}: {d}, {o} = {sign}{arg_d}, {arg_o}")
+            values.append((d, o))
+
+        elif op == OP_BOUNDS_GUARD:
+            p = code[pc + 1]
+            first_d, first_o = values[-code[pc + 2]]
+            box = ", ".join(param(i) for i in range(p, p + 6))
+            condition = f"box_distance({x}, {y}, {z}, {box}) >= -{first_d}"
+            if not first_o.isdigit():
+                condition = f"{first_o} >= 0 and {condition}"
+            guards.append((code[pc + 3], len(lines), condition))
+
+        elif op == OP_EMPTY:
+            d = new_dist()
+            lines.append(f"{d} = {INFINITY!r}")
+            values.append((d, "-1"))
+
+        elif op == OP_CALL:
+            d = new_dist()
+            o = f"o{d[1:]}"
+            lines.append(f"{d}, {o} = call({code[pc + 1]}, {x}, {y}, {z})")
+            values.append((d, o))
+
+        else:
+            raise ValueError(f"Can not generate code for opcode {op} at {pc}")
+
+        pc += OP_SIZES[op]
+
+    while guards:
+        end_guard()
+
+    return lines, values[-1][0], values[-1][1]
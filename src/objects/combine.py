@@ -1,4 +1,7 @@
 from .base import Base, INFINITY
+from .bounds import Bounds
+from .bvh import build_bvh
+from .vectorized import np, empty_result
 from ..vec import Vec3
 from ..vec.types import *
 
@@ -14,8 +17,23 @@ class Container(Base):
             for o in objects:
                 self.add_node(o)
 
+    def invalidate_bounds(self):
+        self._node_bounds = None
+        super().invalidate_bounds()
+
+    def node_bounds(self):
+        """
+        Returns a cached list of tuples of (node, Bounds) for all child nodes
+        """
+        if getattr(self, "_node_bounds", None) is None:
+            self._node_bounds = [(node, node.bounds()) for node in self.nodes]
+        return self._node_bounds
+
 
 class Union(Container):
+    """
+    Union of all child objects.
+    """
 
     def distance(self, pos: Vec3):
         d = INFINITY
@@ -33,38 +51,225 @@ class Union(Container):
                 dist, obj = d, o
         return dist, obj
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        dist, grad = INFINITY, Vec3()
+        for node in self.nodes:
+            d, g = node.distance_gradient(pos, e)
+            if d < dist:
+                dist, grad = d, g
+        return dist, grad
+
+    def calc_bounds(self):
+        if not self.nodes:
+            return Bounds.infinite()
+        bounds = self.nodes[0].bounds()
+        for node in self.nodes[1:]:
+            bounds = bounds.union(node.bounds())
+        return bounds
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        dist, obj = empty_result(len(points))
+        for node in self.nodes:
+            if ignore_objects and node in ignore_objects:
+                continue
+            d, o = node.distance_object_array(points, table, ignore_objects=ignore_objects)
+            closer = d < dist
+            dist = np.where(closer, d, dist)
+            obj = np.where(closer, o, obj)
+        return dist, obj
+
+
+class AcceleratedUnion(Union):
+    """
+    Union of all child objects, queried through a bounding volume hierarchy.
+
+    Each distance query only visits the sub-trees whose box can beat
+    the closest distance found so far, which is roughly O(log n) for
+    many small objects. Unbounded children are checked linearly.
+    With ``ignore_objects`` all children are checked like in ``Union``,
+    because the boxes are no lower bound of the remaining objects' distance.
+
+    The hierarchy is rebuilt when nodes are added or removed and refitted
+    when ``invalidate_bounds`` is called, e.g. after moving a child.
+    The results are the same as for ``Union``.
+    """
+
+    _bvh = None
+    _unbounded = None
+    _needs_refit = False
+
+    def add_node(self, node):
+        super().add_node(node)
+        self._bvh = self._unbounded = None
+
+    def remove_node(self, node):
+        super().remove_node(node)
+        self._bvh = self._unbounded = None
+
+    def invalidate_bounds(self):
+        self._needs_refit = True
+        super().invalidate_bounds()
+
+    def rebuild(self):
+        """
+        Build the hierarchy from scratch
+        """
+        items, self._unbounded = [], []
+        for i, node in enumerate(self.nodes):
+            bounds = node.bounds()
+            if bounds.is_infinite:
+                self._unbounded.append((i, node))
+            else:
+                items.append((i, node, bounds))
+
+        self._bvh = build_bvh(items)
+        self._needs_refit = False
+
+    def refit(self):
+        """
+        Update the boxes of the hierarchy without changing it's structure
+        """
+        if self._bvh is None:
+            return self.rebuild()
+
+        if any(node.bounds().is_infinite for node in self.nodes):
+            return self.rebuild()
+
+        self._bvh.refit()
+        self._needs_refit = False
+
+    def _update(self):
+        if self._unbounded is None:
+            self.rebuild()
+        elif self._needs_refit:
+            self.refit()
+
+    def distance(self, pos: Vec3):
+        return self.distance_object(pos)[0]
+
+    def distance_object(self, pos: Vec3, ignore_objects=None):
+        if ignore_objects:
+            return super().distance_object(pos, ignore_objects=ignore_objects)
+
+        if self._unbounded is None or self._needs_refit:
+            self._update()
+
+        # the closest object with the lowest index wins, like in Union
+        dist, obj, index = INFINITY, None, len(self.nodes)
+
+        for i, node in self._unbounded:
+            d, o = node.distance_object(pos)
+            if d < dist or (d == dist and i < index):
+                dist, obj, index = d, o, i
+
+        stack = [(-INFINITY, self._bvh)] if self._bvh else []
+        while stack:
+            box_dist, bvh = stack.pop()
+            if box_dist > dist:
+                continue
+
+            if bvh.items is not None:
+                for i, node, bounds in bvh.items:
+                    if bounds.distance(pos) > dist:
+                        continue
+                    d, o = node.distance_object(pos)
+                    if d < dist or (d == dist and i < index):
+                        dist, obj, index = d, o, i
+            else:
+                d_left = bvh.left.bounds.distance(pos)
+                d_right = bvh.right.bounds.distance(pos)
+                # the closer box is popped first
+                if d_left <= d_right:
+                    stack.append((d_right, bvh.right))
+                    stack.append((d_left, bvh.left))
+                else:
+                    stack.append((d_left, bvh.left))
+                    stack.append((d_right, bvh.right))
+
+        return dist, obj
+
 
 class Difference(Container):
+    """
+    The first child minus all following children.
+
+    A subtracted child is only evaluated if it's bounding box is closer
+    than the negated distance so far, otherwise it can not change the result.
+    The boxes are skipped with ``ignore_objects``, the result of a child
+    with ignored objects may come from outside it's box.
+    """
+
+    def calc_bounds(self):
+        # the result is never closer than the first object
+        if not self.nodes:
+            return Bounds.infinite()
+        return self.nodes[0].bounds()
 
     def distance(self, pos: Vec3):
         if not self.nodes:
             return INFINITY
-        d = self.nodes[0].distance(pos)
-        for node in self.nodes[1:]:
+        node_bounds = self.node_bounds()
+        d = node_bounds[0][0].distance(pos)
+        for node, bounds in node_bounds[1:]:
+            if bounds.distance(pos) >= -d:
+                continue
             d = max(d, -node.distance(pos))
         return d
 
     def distance_object(self, pos: Vec3, ignore_objects=None):
         dist, obj = INFINITY, None
-        if not self.nodes:
+        if not self.nodes or (ignore_objects and self in ignore_objects):
             return dist, obj
 
-        for node in self.nodes:
-            if ignore_objects and self in ignore_objects:
-                continue
-
+        for node, bounds in self.node_bounds():
             if obj is None:
                 dist, obj = node.distance_object(pos, ignore_objects=ignore_objects)
             else:
+                # the bounds are a lower bound of d, so -d can not be larger than dist
+                if not ignore_objects and bounds.distance(pos) >= -dist:
+                    continue
                 d, o = node.distance_object(pos, ignore_objects=ignore_objects)
                 d = -d
                 if d > dist:
                     dist, obj = d, o
         return dist, obj
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        if not self.nodes:
+            return INFINITY, Vec3()
+        node_bounds = self.node_bounds()
+        dist, grad = node_bounds[0][0].distance_gradient(pos, e)
+        for node, bounds in node_bounds[1:]:
+            if bounds.distance(pos) >= -dist:
+                continue
+            d, g = node.distance_gradient(pos, e)
+            if -d > dist:
+                dist, grad = -d, -g
+        return dist, grad
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        dist, obj = empty_result(len(points))
+        if not self.nodes or (ignore_objects and self in ignore_objects):
+            return dist, obj
+
+        for node in self.nodes:
+            d, o = node.distance_object_array(points, table, ignore_objects=ignore_objects)
+            first = obj < 0
+            replace = first | (-d > dist)
+            dist = np.where(replace, np.where(first, d, -d), dist)
+            obj = np.where(replace, o, obj)
+        return dist, obj
+
 
 class Intersection(Container):
 
+    def calc_bounds(self):
+        # the result is never closer than any of the objects, so pick the smallest box.
+        # The intersection of all boxes is not a lower bound for the max() of distances
+        if not self.nodes:
+            return Bounds.infinite()
+        return min((node.bounds() for node in self.nodes), key=lambda b: b.volume)
+
     def distance(self, pos: Vec3):
         if not self.nodes:
             return INFINITY
@@ -75,13 +280,12 @@ class Intersection(Container):
 
     def distance_object(self, pos: Vec3, ignore_objects=None):
         dist, obj = INFINITY, None
-        if not self.nodes:
+        if not self.nodes or (ignore_objects and self in ignore_objects):
             return dist, obj
 
+        # The bounds can not be used to skip children, they are lower bounds
+        # and a child is only irrelevant if it's distance is below the maximum so far
         for node in self.nodes:
-            if ignore_objects and self in ignore_objects:
-                continue
-
             if obj is None:
                 dist, obj = node.distance_object(pos, ignore_objects=ignore_objects)
             else:
@@ -89,3 +293,25 @@ class Intersection(Container):
                 if d > dist:
                     dist, obj = d, o
         return dist, obj
+
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        if not self.nodes:
+            return INFINITY, Vec3()
+        dist, grad = self.nodes[0].distance_gradient(pos, e)
+        for node in self.nodes[1:]:
+            d, g = node.distance_gradient(pos, e)
+            if d > dist:
+                dist, grad = d, g
+        return dist, grad
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        dist, obj = empty_result(len(points))
+        if not self.nodes or (ignore_objects and self in ignore_objects):
+            return dist, obj
+
+        for node in self.nodes:
+            d, o = node.distance_object_array(points, table, ignore_objects=ignore_objects)
+            replace = (obj < 0) | (d > dist)
+            dist = np.where(replace, d, dist)
+            obj = np.where(replace, o, obj)
+        return dist, obj
@@ -0,0 +1,514 @@
+"""
+Compiles a scene tree into a flat list of opcodes and float parameters.
+
+The ``CompiledScene`` evaluates the program in a single interpreter loop
+on plain floats, without method dispatch per node or ``Vec3`` allocations.
+Results are identical to the tree, because the same float operations
+are performed in the same order.
+"""
+import math
+from array import array
+
+from .base import Base, INFINITY
+from .bounds import BOUNDS_SAFETY
+from .combine import Union, AcceleratedUnion, Difference, Intersection
+from .node_table import NodeTable
+from .primitives import Sphere, Tube, Plane
+from .transform import Translate, Scale, Affine
+from ..vec import Vec3
+from ..vec.types import Sequence
+
+
+# opcodes and their arguments
+OP_EMPTY = 0            # push INFINITY, None
+OP_SPHERE = 1           # object, param: radius
+OP_TUBE = 2             # object, axis, param: radius
+OP_PLANE = 3            # object, param: normal x, y, z
+OP_TRANSLATE = 4        # param: translation x, y, z
+OP_END_TRANSLATE = 5    # object
+OP_SCALE = 6            # param: scale
+OP_END_SCALE = 7        # object, param: scale
+OP_UNION = 8            # number of values
+OP_DIFFERENCE = 9       # number of values
+OP_INTERSECTION = 10    # number of values
+OP_GUARD = 11           # object, jump address: skip code if object is ignored
+OP_CALL = 12            # object: fallback to node.distance_object()
+OP_AFFINE = 13          # param: translation x, y, z, inverse matrix (9)
+OP_END_AFFINE = 14      # object, param: lipschitz factor
+OP_BOUNDS_GUARD = 15    # param: box min x, y, z, max x, y, z, depth, jump address:
+                        # skip the code if the box is not closer than minus the distance
+                        # ``depth`` values down the stack, see ``Difference``
+
+OP_NAMES = {
+    value: key[3:]
+    for key, value in globals().items()
+    if key.startswith("OP_") and isinstance(value, int)
+}
+
+OP_SIZES = {
+    OP_EMPTY: 1,
+    OP_SPHERE: 3,
+    OP_TUBE: 4,
+    OP_PLANE: 3,
+    OP_TRANSLATE: 2,
+    OP_END_TRANSLATE: 2,
+    OP_SCALE: 2,
+    OP_END_SCALE: 3,
+    OP_UNION: 2,
+    OP_DIFFERENCE: 2,
+    OP_INTERSECTION: 2,
+    OP_GUARD: 3,
+    OP_CALL: 2,
+    OP_AFFINE: 2,
+    OP_END_AFFINE: 3,
+    OP_BOUNDS_GUARD: 4,
+}
+
+SELF_GUARDED_TYPES = (Sphere, Tube, Plane, Difference, Intersection)
+
+
+def box_distance(params: Sequence[float], p: int, x: float, y: float, z: float) -> float:
+    """
+    ``Bounds.distance`` of the box stored at ``params[p:p + 6]``
+    """
+    dx = max(params[p] - x, 0., x - params[p + 3])
+    dy = max(params[p + 1] - y, 0., y - params[p + 4])
+    dz = max(params[p + 2] - z, 0., z - params[p + 5])
+    if not (dx or dy or dz):
+        return -INFINITY
+    return math.sqrt(dx * dx + dy * dy + dz * dz) * BOUNDS_SAFETY
+
+
+def compile_scene(root: Base) -> "CompiledScene":
+    """
+    Flatten the tree below ``root`` into a ``CompiledScene``
+    """
+    return CompiledScene(root)
+
+
+class CompiledScene:
+    """
+    A scene compiled to opcodes.
+
+    It has the same ray-marching interface as ``Base``, so it can be
+    passed to the ``Raymarcher`` in place of the scene.
+
+    ``code`` is used for plain queries, ``guarded_code`` additionally
+    contains the checks for ``ignore_objects``.
+    """
+
+    def __init__(self, root: Base):
+        self.root = root
+        self.objects = NodeTable(root)
+        self.params = array("d")
+        self.code = array("i")
+        self._compile(root, self.code, guarded=False)
+        self.guarded_code = array("i")
+        self._compile(root, self.guarded_code, guarded=True)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self.code)} ops, {len(self.objects)} objects)"
+
+    def disassemble(self, guarded: bool = False) -> str:
+        """
+        Returns the program as human-readable multi-line string
+        """
+        code = self.guarded_code if guarded else self.code
+        lines = []
+        pc = 0
+        while pc < len(code):
+            op = code[pc]
+            size = OP_SIZES[op]
+            args = ", ".join(str(a) for a in code[pc + 1:pc + size])
+            lines.append(f"{pc:5} {OP_NAMES[op]} {args}".rstrip())
+            pc += size
+        return "\n".join(lines)
+
+    # ---- compiler ----
+
+    def _add_params(self, *values) -> int:
+        index = len(self.params)
+        self.params.extend(float(v) for v in values)
+        return index
+
+    def _compile(self, node: Base, code: array, guarded: bool):
+        """
+        Emit code which pushes the result of ``node.distance_object`` onto the stack.
+
+        If ``guarded`` is True, ``ignore_objects`` are checked at the same
+        places as in the tree's ``distance_object`` methods.
+        """
+        node_type = type(node)
+
+        if node_type in (Sphere, Tube, Plane):
+            if guarded:
+                guard = self._begin_guard(node, code)
+            obj = self.objects.index(node)
+            if node_type is Sphere:
+                code.extend((OP_SPHERE, obj, self._add_params(node.radius)))
+            elif node_type is Tube:
+                code.extend((OP_TUBE, obj, node.axis, self._add_params(node.radius)))
+            else:
+                code.extend((OP_PLANE, obj, self._add_params(*node.normal)))
+            if guarded:
+                self._end_guard(guard, code)
+
+        elif node_type in (Translate, Scale, Affine):
+            if not node.nodes:
+                code.append(OP_EMPTY)
+                return
+            child = node.nodes[0]
+            if guarded:
+                guard = self._begin_guard(child, code)
+            # the child is evaluated via .distance(), without ignore_objects
+            if node_type is Translate:
+                code.extend((OP_TRANSLATE, self._add_params(*node.translation)))
+                self._compile(child, code, guarded=False)
+                code.extend((OP_END_TRANSLATE, self.objects.index(child)))
+            elif node_type is Affine:
+                code.extend((OP_AFFINE, self._add_params(*node.translation, *node._inverse)))
+                self._compile(child, code, guarded=False)
+                code.extend((OP_END_AFFINE, self.objects.index(child), self._add_params(node.lipschitz)))
+            else:
+                param = self._add_params(node.scale)
+                code.extend((OP_SCALE, param))
+                self._compile(child, code, guarded=False)
+                code.extend((OP_END_SCALE, self.objects.index(child), param))
+            if guarded:
+                self._end_guard(guard, code)
+
+        elif node_type in (Union, AcceleratedUnion):
+            for child in node.nodes:
+                # primitives and CSG nodes check themselves
+                child_guard = guarded and type(child) not in SELF_GUARDED_TYPES
+                if child_guard:
+                    guard = self._begin_guard(child, code)
+                self._compile(child, code, guarded)
+                if child_guard:
+                    self._end_guard(guard, code)
+            code.extend((OP_UNION, len(node.nodes)))
+
+        elif node_type in (Difference, Intersection):
+            if guarded:
+                guard = self._begin_guard(node, code)
+            for i, child in enumerate(node.nodes):
+                bounds = child.bounds()
+                # with ignore_objects the bounds are no lower bound, see Difference
+                if node_type is Difference and i > 0 and not guarded and not bounds.is_infinite:
+                    code.extend((OP_BOUNDS_GUARD, self._add_params(*bounds.min, *bounds.max), i, 0))
+                    bounds_guard = len(code) - 1
+                    self._compile(child, code, guarded)
+                    self._end_guard(bounds_guard, code)
+                else:
+                    self._compile(child, code, guarded)
+            code.extend((OP_DIFFERENCE if node_type is Difference else OP_INTERSECTION, len(node.nodes)))
+            if guarded:
+                self._end_guard(guard, code)
+
+        else:
+            code.extend((OP_CALL, self.objects.index(node)))
+
+    def _begin_guard(self, node: Base, code: array) -> int:
+        code.extend((OP_GUARD, self.objects.index(node), 0))
+        return len(code) - 1
+
+    def _end_guard(self, guard: int, code: array):
+        code[guard] = len(code)
+
+    # ---- interpreter ----
+
+    def _ignore_mask(self, ignore_objects) -> int:
+        """
+        Returns ``ignore_objects`` as bitmask of indices in ``objects``.
+
+        An int is a bitmask of node IDs, the indices in the scene root's ``node_table``,
+        like for ``Base.raymarch``. It differs from ``objects`` if ``root`` is a subtree.
+        """
+        if not ignore_objects:
+            return 0
+        if isinstance(ignore_objects, int):
+            if self.root.node_parent is None:
+                return ignore_objects
+            ignore_objects = self.root.node_root.node_table().nodes_of_mask(ignore_objects)
+        # other objects are never hit, so they need no bit
+        return self.objects.mask(node for node in ignore_objects if node in self.objects)
+
+    def _run(self, x: float, y: float, z: float, ignore: int = 0):
+        """
+        Execute the program at position x, y, z
+
+        :param ignore: bitmask of indices in ``objects``, see ``_ignore_mask``
+        :return: tuple of (distance, object index)
+        """
+        code = self.guarded_code if ignore else self.code
+        params = self.params
+        dists, objs, points = [], [], []
+
+        pc = 0
+        end = len(code)
+        while pc < end:
+            op = code[pc]
+
+            if op == OP_SPHERE:
+                dists.append(math.sqrt(x * x + y * y + z * z) - params[code[pc + 2]])
+                objs.append(code[pc + 1])
+                pc += 3
+
+            elif op == OP_TRANSLATE:
+                p = code[pc + 1]
+                points.append((x, y, z))
+                x, y, z = x - params[p], y - params[p + 1], z - params[p + 2]
+                pc += 2
+
+            elif op == OP_END_TRANSLATE:
+                x, y, z = points.pop()
+                objs[-1] = code[pc + 1]
+                pc += 2
+
+            elif op == OP_UNION:
+                num = code[pc + 1]
+                dist, obj = INFINITY, -1
+                if num:
+                    for d, o in zip(dists[-num:], objs[-num:]):
+                        if d < dist:
+                            dist, obj = d, o
+                    del dists[-num:], objs[-num:]
+                dists.append(dist)
+                objs.append(obj)
+                pc += 2
+
+            elif op == OP_PLANE:
+                p = code[pc + 2]
+                dists.append(x * params[p] + y * params[p + 1] + z * params[p + 2])
+                objs.append(code[pc + 1])
+                pc += 3
+
+            elif op == OP_TUBE:
+                axis = code[pc + 2]
+                if axis == 0:
+                    d = math.sqrt(0. + y * y + z * z)
+                elif axis == 1:
+                    d = math.sqrt(x * x + 0. + z * z)
+                else:
+                    d = math.sqrt(x * x + y * y + 0.)
+                dists.append(d - params[code[pc + 3]])
+                objs.append(code[pc + 1])
+                pc += 4
+
+            elif op == OP_SCALE:
+                s = params[code[pc + 1]]
+                points.append((x, y, z))
+                x, y, z = x / s, y / s, z / s
+                pc += 2
+
+            elif op == OP_END_SCALE:
+                x, y, z = points.pop()
+                dists[-1] *= params[code[pc + 2]]
+                objs[-1] = code[pc + 1]
+                pc += 3
+
+            elif op == OP_AFFINE:
+                p = code[pc + 1]
+                points.append((x, y, z))
+                x, y, z = x - params[p], y - params[p + 1], z - params[p + 2]
+                x, y, z = (
+                    params[p + 3] * x + params[p + 4] * y + params[p + 5] * z,
+                    params[p + 6] * x + params[p + 7] * y + params[p + 8] * z,
+                    params[p + 9] * x + params[p + 10] * y + params[p + 11] * z,
+                )
+                pc += 2
+
+            elif op == OP_END_AFFINE:
+                x, y, z = points.pop()
+                dists[-1] *= params[code[pc + 2]]
+                objs[-1] = code[pc + 1]
+                pc += 3
+
+            elif op == OP_DIFFERENCE or op == OP_INTERSECTION:
+                num = code[pc + 1]
+                dist, obj = INFINITY, -1
+                if num:
+                    sign = -1. if op == OP_DIFFERENCE else 1.
+                    for d, o in zip(dists[-num:], objs[-num:]):
+                        if obj < 0:
+                            dist, obj = d, o
+                        else:
+                            d = sign * d
+                            if d > dist:
+                                dist, obj = d, o
+                    del dists[-num:], objs[-num:]
+                dists.append(dist)
+                objs.append(obj)
+                pc += 2
+
+            elif op == OP_BOUNDS_GUARD:
+                depth = code[pc + 2]
+                if objs[-depth] >= 0 and box_distance(params, code[pc + 1], x, y, z) >= -dists[-depth]:
+                    dists.append(INFINITY)
+                    objs.append(-1)
+                    pc = code[pc + 3]
+                else:
+                    pc += 4
+
+            elif op == OP_GUARD:
+                if ignore >> code[pc + 1] & 1:
+                    dists.append(INFINITY)
+                    objs.append(-1)
+                    pc = code[pc + 2]
+                else:
+                    pc += 3
+
+            elif op == OP_EMPTY:
+                dists.append(INFINITY)
+                objs.append(-1)
+                pc += 1
+
+            elif op == OP_CALL:
+                d, o = self.objects[code[pc + 1]].distance_object(
+                    Vec3(x, y, z), ignore_objects=self.objects.nodes_of_mask(ignore) if ignore else None,
+                )
+                dists.append(d)
+                objs.append(self.objects.index(o))
+                pc += 2
+
+            else:
+                raise ValueError(f"Invalid opcode {op} at {pc}")
+
+        return dists[-1], objs[-1]
+
+    # ---- Base interface ----
+
+    def distance(self, pos: Vec3):
+        return self._run(pos.x, pos.y, pos.z)[0]
+
+    def distance_object(self, pos: Vec3, ignore_objects=None):
+        d, o = self._run(pos.x, pos.y, pos.z, self._ignore_mask(ignore_objects))
+        return d, self.objects[o]
+
+    def normal(self, pos: Vec3, e: float = 0.0001, analytic: bool = False):
+        if analytic:
+            return self.root.normal(pos, e, analytic=True)
+
+        x, y, z = pos
+        run = self._run
+        d1 = run(x + e, y - e, z - e)[0]
+        d2 = run(x - e, y - e, z + e)[0]
+        d3 = run(x - e, y + e, z - e)[0]
+        d4 = run(x + e, y + e, z + e)[0]
+        return Vec3(
+            d1 - d2 - d3 + d4,
+            -d1 - d2 + d3 + d4,
+            -d1 + d2 - d3 + d4,
+        ).normalize_safe()
+
+    def raymarch(
+            self,
+            origin: Vec3,
+            direction: Vec3,
+            max_iter: int = 1000,
+            ignore_objects=None,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        x, y, z, o, _ = self._march(
+            *origin, *direction, max_iter, self._ignore_mask(ignore_objects), omega, epsilon, cone_angle, max_distance,
+        )
+        return Vec3(x, y, z), self.objects[o]
+
+    def raymarch_many(
+            self,
+            origins: Sequence[Vec3],
+            directions: Sequence[Vec3],
+            max_iter: int = 1000,
+            ignore_objects=None,
+            vectorized: bool = False,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        if vectorized:
+            return self.root.raymarch_many(
+                origins, directions, max_iter, ignore_objects, vectorized,
+                epsilon=epsilon, cone_angle=cone_angle, max_distance=max_distance,
+            )
+
+        ignore = self._ignore_mask(ignore_objects)
+        positions, objects, iterations = [], [], []
+        for origin, direction in zip(origins, directions):
+            x, y, z, o, it = self._march(
+                *origin, *direction, max_iter, ignore, omega, epsilon, cone_angle, max_distance,
+            )
+            positions.append(Vec3(x, y, z))
+            objects.append(self.objects[o])
+            iterations.append(it)
+
+        return positions, objects, iterations
+
+    def _march(
+            self,
+            x: float, y: float, z: float,
+            dx: float, dy: float, dz: float,
+            max_iter: int,
+            ignore: int = 0,
+            omega: float = 1.,
+            epsilon: float = 0.0001,
+            cone_angle: float = 0.,
+            max_distance: float = math.inf,
+    ):
+        """
+        March a single ray, optionally over-relaxed like ``Base._raymarch_relaxed``
+
+        :param ignore: bitmask of indices in ``objects``, see ``_ignore_mask``
+        :return: tuple of (x, y, z, object index, number of iterations)
+        """
+        run = self._run
+        t = 0.
+        if omega > 1.:
+            step = prev_radius = 0.
+            for it in range(max_iter):
+                d, o = run(x, y, z, ignore)
+                radius = abs(d)
+
+                if omega > 1. and radius + prev_radius < step:
+                    back = step - prev_radius
+                    t -= back
+                    x -= back * dx
+                    y -= back * dy
+                    z -= back * dz
+                    omega = 1.
+                    continue
+
+                if radius <= epsilon + t * cone_angle:
+                    return x, y, z, o, it + 1
+
+                step = d * omega
+                prev_radius = radius
+                t += step
+                if t > max_distance:
+                    return x, y, z, -1, it + 1
+
+                x += step * dx
+                y += step * dy
+                z += step * dz
+
+            return x, y, z, -1, max_iter
+
+        for it in range(max_iter):
+
+            d, o = run(x, y, z, ignore)
+
+            if d <= epsilon + t * cone_angle:
+                return x, y, z, o, it + 1
+
+            t += d
+            if t > max_distance:
+                return x, y, z, -1, it + 1
+
+            x += d * dx
+            y += d * dy
+            z += d * dz
+
+        return x, y, z, -1, max_iter
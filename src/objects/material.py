@@ -43,7 +43,7 @@ class Checker(Material):
         self.scale = Vec3(scale)
 
     def materials(self, pos: Vec3):
-        pos = (pos % self.scale) / self.scale
+        pos = pos.mod_vec(self.scale).idiv_vec(self.scale)
         s = False
         if pos.x >= .5:
             s = not s
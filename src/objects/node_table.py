@@ -0,0 +1,83 @@
+"""
+Dense integer indices for scene nodes and the objects returned by ``distance_object``.
+"""
+
+
+class ObjectTable:
+    """
+    Maps the objects returned by ``distance_object`` to integer indices.
+
+    Index ``-1`` stands for ``None``.
+    """
+    def __init__(self):
+        self.objects = []
+        self._indices = {}
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __getitem__(self, index: int):
+        return None if index < 0 else self.objects[index]
+
+    def __contains__(self, obj):
+        return obj in self._indices
+
+    def index(self, obj) -> int:
+        if obj is None:
+            return -1
+        index = self._indices.get(obj)
+        if index is None:
+            index = self._indices[obj] = len(self.objects)
+            self.objects.append(obj)
+        return index
+
+
+class NodeTable(ObjectTable):
+    """
+    An ``ObjectTable`` which assigns the dense indices ``0 .. N-1``
+    to all nodes of a scene in pre-order.
+
+    The indices are the node IDs, see ``Base.node_id``. They only depend
+    on the tree structure, so copies of the scene in other processes
+    have the same IDs and results can be passed around as integers.
+    """
+    def __init__(self, root):
+        super().__init__()
+        for node in root.iter_pre_order():
+            self.index(node)
+        self.materials = [getattr(node, "material", None) for node in self.objects]
+
+    def material(self, index: int):
+        """
+        Returns the material of the node with ID ``index`` or None
+        """
+        if 0 <= index < len(self.materials):
+            return self.materials[index]
+        return getattr(self[index], "material", None)
+
+    def mask(self, nodes) -> int:
+        """
+        Returns the bitmask of the indices of ``nodes``. For the table of
+        the scene root these are the node IDs and the mask can be passed
+        as ``ignore_objects`` to the ray-marching methods, see ``Base.node_id``.
+
+        Raises ``ValueError`` for nodes which are not in the table.
+        """
+        mask = 0
+        for node in nodes:
+            index = self._indices.get(node)
+            if index is None:
+                raise ValueError(f"{node!r} is not a node of this table")
+            mask |= 1 << index
+        return mask
+
+    def nodes_of_mask(self, mask: int) -> set:
+        """
+        Returns the set of nodes whose ID bits are set in ``mask``
+        """
+        nodes = set()
+        while mask:
+            bit = mask & -mask
+            nodes.add(self[bit.bit_length() - 1])
+            mask ^= bit
+        return nodes
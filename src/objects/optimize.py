@@ -0,0 +1,42 @@
+"""
+Passes which rewrite a scene tree into a cheaper, equivalent one.
+"""
+from .base import Base
+from .transform import Translate, Scale, Affine, compose_affine
+
+
+FOLDABLE_TYPES = (Translate, Scale, Affine)
+
+
+def fold_transforms(node: Base) -> Base:
+    """
+    Replace each chain of two or more nested transforms below and including ``node``
+    with a single ``Affine``, e.g. as created by ``Sphere().scale(2).translate((1, 0, 0))``.
+
+    The tree is changed in place. The hit object reported for a folded chain
+    is the innermost child instead of the first transform below the chain's top.
+
+    :param node: the scene
+    :return: the new scene root, which is ``node`` unless ``node`` itself was folded
+    """
+    if _is_foldable(node) and node.nodes and _is_foldable(node.nodes[0]):
+        transform = node.affine()
+        child = node.nodes[0]
+        while _is_foldable(child) and child.nodes:
+            transform = compose_affine(transform, child.affine())
+            child = child.nodes[0]
+
+        child.node_parent.remove_node(child)
+        matrix, translation = transform
+        folded = Affine(fold_transforms(child), matrix=matrix, translation=translation)
+        if node.node_parent is not None:
+            node.node_parent.replace_node(node, folded)
+        return folded
+
+    for child in list(node.nodes):
+        fold_transforms(child)
+    return node
+
+
+def _is_foldable(node) -> bool:
+    return type(node) in FOLDABLE_TYPES
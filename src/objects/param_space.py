@@ -4,6 +4,25 @@ from ..vec import Vec3
 
 class ParameterizedSpaceNode(ParameterizedTreeNode):
 
+    # increased whenever a parameter or the tree structure changes,
+    # cached global transforms of an older version are recalculated
+    _transform_version = 0
+    # tuple of (version, offset, scale), offset and scale are None
+    # if the transform can not be expressed as translation and uniform scale
+    _global_transform = None
+
+    def on_parameter_changed(self, name: str):
+        super().on_parameter_changed(name)
+        self.invalidate_transforms()
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.invalidate_transforms()
+
+    def remove_node(self, node):
+        super().remove_node(node)
+        self.invalidate_transforms()
+
     # ------ transforms ------
 
     def to_local_position(self, outside_pos: Vec3):
@@ -24,7 +43,64 @@ class ParameterizedSpaceNode(ParameterizedTreeNode):
         """
         return local_pos
 
+    def local_transform(self):
+        """
+        Returns the tuple (offset, scale) such that
+        ``from_local_position(pos) == pos * scale + offset``
+        and ``to_local_position(pos) == (pos - offset) / scale``.
+
+        Returns None if this node's transform is something else,
+        derived classes which override the conversion methods
+        should override this as well.
+
+        :return: tuple of (Vec3, float) or None
+        """
+        if type(self).to_local_position is not ParameterizedSpaceNode.to_local_position:
+            return None
+        return Vec3(), 1.
+
+    @staticmethod
+    def invalidate_transforms():
+        """
+        Clears the cached global transforms of all nodes.
+
+        Called automatically when a parameter is assigned or a node is added or removed.
+        """
+        ParameterizedSpaceNode._transform_version += 1
+
+    def global_transform(self):
+        """
+        Returns the composed ``local_transform`` of this node and all parents,
+        such that ``local_to_global_position(pos) == pos * scale + offset``.
+
+        The value is cached until ``invalidate_transforms`` is called.
+
+        :return: tuple of (Vec3, float) or None
+        """
+        cached = self._global_transform
+        version = ParameterizedSpaceNode._transform_version
+        if cached is not None and cached[0] == version:
+            return None if cached[1] is None else cached[1:]
+
+        transform = self.local_transform()
+        parent = self.node_parent
+        if transform is not None and parent is not None:
+            parent_transform = parent.global_transform() if isinstance(parent, ParameterizedSpaceNode) else None
+            if parent_transform is None:
+                transform = None
+            else:
+                offset, scale = parent_transform
+                transform = offset.madd(transform[0], scale), scale * transform[1]
+
+        self._global_transform = (version, ) + (transform or (None, None))
+        return transform
+
     def global_to_local_position(self, global_pos: Vec3):
+        transform = self.global_transform()
+        if transform is not None:
+            offset, scale = transform
+            return global_pos.sub_vec(offset).idiv_scalar(scale)
+
         node = self
         nodes = []
         while node:
@@ -38,6 +114,11 @@ class ParameterizedSpaceNode(ParameterizedTreeNode):
         return pos
 
     def local_to_global_position(self, local_pos: Vec3):
+        transform = self.global_transform()
+        if transform is not None:
+            offset, scale = transform
+            return offset.madd(local_pos, scale)
+
         node = self
         pos = local_pos
         while node is not None:
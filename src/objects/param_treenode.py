@@ -4,15 +4,31 @@ from .treenode import TreeNode
 class ParameterizedTreeNode(TreeNode):
 
     __instance_counter = 0
+    # until __init__ sets the parameter names
+    __parameters = None
 
     def __init__(self, **parameters):
-        self.__instance_counter += 1
-        super().__init__(f"{self.__class__.__name__}-{self.__instance_counter}")
+        ParameterizedTreeNode.__instance_counter += 1
+        super().__init__(f"{self.__class__.__name__}-{ParameterizedTreeNode.__instance_counter}")
 
         self.__parameters = parameters
         for key, value in self.__parameters.items():
             setattr(self, key, value)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if self.__parameters is not None and name in self.__parameters:
+            self.on_parameter_changed(name)
+
+    def on_parameter_changed(self, name: str):
+        """
+        Called after a parameter has been assigned.
+
+        Changing a mutable parameter in place, e.g. ``node.translation.x = 1``,
+        is not noticed, assign the parameter again in that case.
+        """
+        pass
+
     @property
     def parameters(self):
         return {
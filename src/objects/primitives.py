@@ -1,5 +1,9 @@
+import math
+
 from .base import Base, INFINITY
+from .bounds import Bounds
 from .material import Material
+from .vectorized import np, empty_result, length
 from ..vec import Vec3
 from ..vec.types import *
 
@@ -31,11 +35,27 @@ class Sphere(Primitive):
             material=material,
         )
 
+    def distance(self, pos: Vec3):
+        return pos.length() - self.radius
+
     def distance_object(self, pos: Vec3, ignore_objects=None):
         if ignore_objects and self in ignore_objects:
             return INFINITY, None
         return pos.length() - self.radius, self
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        l = pos.length()
+        return l - self.radius, pos.div_scalar(l) if l else Vec3()
+
+    def calc_bounds(self):
+        r = abs(self.radius)
+        return Bounds((-r, -r, -r), (r, r, r))
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if ignore_objects and self in ignore_objects:
+            return empty_result(len(points))
+        return length(points) - self.radius, np.full(len(points), table.index(self))
+
 
 class Tube(Primitive):
     def __init__(
@@ -54,6 +74,11 @@ class Tube(Primitive):
             material=material,
         )
 
+    def distance(self, pos: Vec3):
+        pos = pos.copy()
+        pos[self.axis] = 0.
+        return pos.length() - self.radius
+
     def distance_object(self, pos: Vec3, ignore_objects=None):
         if ignore_objects and self in ignore_objects:
             return INFINITY, None
@@ -61,6 +86,25 @@ class Tube(Primitive):
         pos[self.axis] = 0.
         return pos.length() - self.radius, self
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        pos = pos.copy()
+        pos[self.axis] = 0.
+        l = pos.length()
+        return l - self.radius, pos.div_scalar(l) if l else Vec3()
+
+    def calc_bounds(self):
+        r = abs(self.radius)
+        mi, ma = [-r, -r, -r], [r, r, r]
+        mi[self.axis], ma[self.axis] = -math.inf, math.inf
+        return Bounds(mi, ma)
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if ignore_objects and self in ignore_objects:
+            return empty_result(len(points))
+        points = points.copy()
+        points[:, self.axis] = 0.
+        return length(points) - self.radius, np.full(len(points), table.index(self))
+
 
 class Plane(Primitive):
     def __init__(
@@ -74,8 +118,21 @@ class Plane(Primitive):
             material=material,
         )
 
+    def distance(self, pos: Vec3):
+        return pos.dot(self.normal)
+
     def distance_object(self, pos: Vec3, ignore_objects=None):
         if ignore_objects and self in ignore_objects:
             return INFINITY, None
         return pos.dot(self.normal), self
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        return pos.dot(self.normal), self.normal.copy()
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if ignore_objects and self in ignore_objects:
+            return empty_result(len(points))
+        n = self.normal
+        d = points[:, 0] * n.x + points[:, 1] * n.y + points[:, 2] * n.z
+        return d, np.full(len(points), table.index(self))
+
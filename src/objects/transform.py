@@ -1,4 +1,8 @@
+import math
+
 from .base import Base, INFINITY
+from .bounds import Bounds
+from .vectorized import np, empty_result
 from ..vec import Vec3
 from ..vec.types import *
 
@@ -10,6 +14,8 @@ class TransformBase(Base):
             **parameters
     ):
         super().__init__(**parameters)
+        # reused for the child's position in distance queries, to avoid temporaries
+        self._local_pos = Vec3()
         if object:
             self.add_node(object)
 
@@ -19,6 +25,13 @@ class TransformBase(Base):
     def from_local_position(self, local_pos: Vec3):
         raise NotImplementedError
 
+    def affine(self):
+        """
+        Returns this transform as tuple of (matrix, translation),
+        see ``Affine``
+        """
+        raise NotImplementedError
+
 
 class Translate(TransformBase):
 
@@ -33,18 +46,47 @@ class Translate(TransformBase):
             object=object,
         )
 
+    def distance(self, pos: Vec3):
+        if not self.nodes:
+            return INFINITY
+        return self.nodes[0].distance(pos.sub_into(self.translation, self._local_pos))
+
     def distance_object(self, pos: Vec3, ignore_objects=None):
         if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
             return INFINITY, None
 
-        pos = pos - self.translation
+        pos = pos.sub_into(self.translation, self._local_pos)
         return self.nodes[0].distance(pos), self.nodes[0]
 
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        if not self.nodes:
+            return INFINITY, Vec3()
+        return self.nodes[0].distance_gradient(pos.sub_vec(self.translation), e)
+
+    def calc_bounds(self):
+        if not self.nodes:
+            return Bounds.infinite()
+        return self.nodes[0].bounds().translated(self.translation)
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
+            return empty_result(len(points))
+
+        points = points - np.array(tuple(self.translation))
+        d, _ = self.nodes[0].distance_object_array(points, table)
+        return d, np.full(len(points), table.index(self.nodes[0]))
+
     def to_local_position(self, outside_pos: Vec3):
-        return outside_pos - self.translation
+        return outside_pos.sub_vec(self.translation)
 
     def from_local_position(self, local_pos: Vec3):
-        return local_pos + self.translation
+        return local_pos.add_vec(self.translation)
+
+    def local_transform(self):
+        return self.translation.copy(), 1.
+
+    def affine(self):
+        return IDENTITY_MATRIX, tuple(self.translation)
 
 
 class Scale(TransformBase):
@@ -60,15 +102,208 @@ class Scale(TransformBase):
             object=object,
         )
 
+    def distance(self, pos: Vec3):
+        if not self.nodes:
+            return INFINITY
+        s = self.scale
+        return self.nodes[0].distance(self._local_pos.set(pos.x / s, pos.y / s, pos.z / s)) * s
+
+    def distance_object(self, pos: Vec3, ignore_objects=None):
+        if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
+            return INFINITY, None
+
+        s = self.scale
+        pos = self._local_pos.set(pos.x / s, pos.y / s, pos.z / s)
+        return self.nodes[0].distance(pos) * s, self.nodes[0]
+
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        if not self.nodes:
+            return INFINITY, Vec3()
+        # d/dp s * f(p / s) = f'(p / s)
+        d, grad = self.nodes[0].distance_gradient(pos.div_scalar(self.scale), e / abs(self.scale))
+        return d * self.scale, grad
+
+    def calc_bounds(self):
+        if not self.nodes:
+            return Bounds.infinite()
+        return self.nodes[0].bounds().scaled(self.scale)
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
+            return empty_result(len(points))
+
+        d, _ = self.nodes[0].distance_object_array(points / self.scale, table)
+        return d * self.scale, np.full(len(points), table.index(self.nodes[0]))
+
+    def to_local_position(self, outside_pos: Vec3):
+        return outside_pos.div_scalar(self.scale)
+
+    def from_local_position(self, local_pos: Vec3):
+        return local_pos.mul_scalar(self.scale)
+
+    def local_transform(self):
+        return Vec3(), self.scale
+
+    def affine(self):
+        s = self.scale
+        return (s, 0., 0., 0., s, 0., 0., 0., s), (0., 0., 0.)
+
+
+IDENTITY_MATRIX = (1., 0., 0., 0., 1., 0., 0., 0., 1.)
+
+
+class Affine(TransformBase):
+    """
+    Rotation, uniform scale and translation.
+
+    ``matrix`` is a row-major 3x3 matrix as sequence of 9 floats,
+    the outside position is ``matrix * local + translation``.
+
+    Only rotation (or mirroring) with uniform scale keeps the distance field exact,
+    the child's distance is multiplied by the scale, which is the
+    Lipschitz factor of the transform.
+    """
+
+    def __init__(
+            self,
+            object: Base = None,
+            matrix: Sequence[float] = IDENTITY_MATRIX,
+            translation: Vector3 = (0, 0, 0),
+    ):
+        self.matrix = tuple(float(v) for v in matrix)
+        self.translation = Vec3(translation)
+        super().__init__(
+            matrix=self.matrix,
+            translation=self.translation,
+            object=object,
+        )
+
+    @staticmethod
+    def rotation_matrix(axis: Vector3, degree: float):
+        """
+        Returns the matrix rotating around ``axis``, like ``Vec3.rotate_axis``
+        """
+        columns = [Vec3(v).rotate_axis(axis, degree) for v in ((1, 0, 0), (0, 1, 0), (0, 0, 1))]
+        return tuple(c[row] for row in range(3) for c in columns)
+
+    def on_parameter_changed(self, name: str):
+        if name == "matrix":
+            self._update_matrix()
+        super().on_parameter_changed(name)
+
+    def _update_matrix(self):
+        m = self.matrix
+        if len(m) != 9:
+            raise ValueError(f"Affine matrix needs 9 values, got {len(m)}")
+        # M^T * M must be scale^2 * identity
+        columns = (m[0::3], m[1::3], m[2::3])
+        dots = [
+            sum(a * b for a, b in zip(columns[i], columns[j]))
+            for i in range(3) for j in range(3)
+        ]
+        scale2 = dots[0]
+        tolerance = 1e-9 * scale2
+        if not scale2 or any(
+                abs(d - (scale2 if i in (0, 4, 8) else 0.)) > tolerance
+                for i, d in enumerate(dots)
+        ):
+            raise ValueError(f"Affine matrix must be a rotation with uniform scale, got {m}")
+
+        self.lipschitz = math.sqrt(scale2)
+        # the inverse is the transpose divided by scale^2
+        self._inverse = tuple(m[col * 3 + row] / scale2 for row in range(3) for col in range(3))
+
+    def distance(self, pos: Vec3):
+        if not self.nodes:
+            return INFINITY
+        return self.nodes[0].distance(self._to_local(pos)) * self.lipschitz
+
     def distance_object(self, pos: Vec3, ignore_objects=None):
         if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
             return INFINITY, None
+        return self.nodes[0].distance(self._to_local(pos)) * self.lipschitz, self.nodes[0]
+
+    def _to_local(self, pos: Vec3):
+        """
+        Returns the local position in the reused ``_local_pos``
+        """
+        x, y, z = pos.sub_into(self.translation, self._local_pos)
+        m = self._inverse
+        return self._local_pos.set(
+            m[0] * x + m[1] * y + m[2] * z,
+            m[3] * x + m[4] * y + m[5] * z,
+            m[6] * x + m[7] * y + m[8] * z,
+        )
 
-        pos = pos / self.scale
-        return self.nodes[0].distance(pos) * self.scale, self.nodes[0]
+    def distance_gradient(self, pos: Vec3, e: float = 0.0001):
+        if not self.nodes:
+            return INFINITY, Vec3()
+        s = self.lipschitz
+        # d/dp s * f(M^-1 * (p - t)) = M * f'(...) / s
+        d, grad = self.nodes[0].distance_gradient(self.to_local_position(pos), e / s)
+        gx, gy, gz = grad
+        m = self.matrix
+        return d * s, Vec3(
+            (m[0] * gx + m[1] * gy + m[2] * gz) / s,
+            (m[3] * gx + m[4] * gy + m[5] * gz) / s,
+            (m[6] * gx + m[7] * gy + m[8] * gz) / s,
+        )
+
+    def calc_bounds(self):
+        if not self.nodes:
+            return Bounds.infinite()
+        return self.nodes[0].bounds().transformed(self.matrix, self.translation)
+
+    def distance_object_array(self, points, table, ignore_objects=None):
+        if not self.nodes or (ignore_objects and self.nodes[0] in ignore_objects):
+            return empty_result(len(points))
+
+        points = points - np.array(tuple(self.translation))
+        points = points @ np.array(self._inverse).reshape(3, 3).T
+        d, _ = self.nodes[0].distance_object_array(points, table)
+        return d * self.lipschitz, np.full(len(points), table.index(self.nodes[0]))
 
     def to_local_position(self, outside_pos: Vec3):
-        return outside_pos / self.scale
+        x, y, z = outside_pos.sub_vec(self.translation)
+        m = self._inverse
+        return Vec3(
+            m[0] * x + m[1] * y + m[2] * z,
+            m[3] * x + m[4] * y + m[5] * z,
+            m[6] * x + m[7] * y + m[8] * z,
+        )
 
     def from_local_position(self, local_pos: Vec3):
-        return local_pos * self.scale
+        x, y, z = local_pos
+        m, t = self.matrix, self.translation
+        return Vec3(
+            m[0] * x + m[1] * y + m[2] * z + t.x,
+            m[3] * x + m[4] * y + m[5] * z + t.y,
+            m[6] * x + m[7] * y + m[8] * z + t.z,
+        )
+
+    def local_transform(self):
+        m = self.matrix
+        if m[1] or m[2] or m[3] or m[5] or m[6] or m[7] or not m[0] == m[4] == m[8]:
+            return None
+        return self.translation.copy(), m[0]
+
+    def affine(self):
+        return self.matrix, tuple(self.translation)
+
+
+def compose_affine(outer, inner):
+    """
+    Returns the (matrix, translation) tuple of applying the ``inner``
+    transform first and then the ``outer``, see ``TransformBase.affine``
+    """
+    m, t = outer
+    n, u = inner
+    matrix = tuple(
+        m[row * 3] * n[col] + m[row * 3 + 1] * n[3 + col] + m[row * 3 + 2] * n[6 + col]
+        for row in range(3) for col in range(3)
+    )
+    translation = tuple(
+        m[row * 3] * u[0] + m[row * 3 + 1] * u[1] + m[row * 3 + 2] * u[2] + t[row]
+        for row in range(3)
+    )
+    return matrix, translation
@@ -1,3 +1,6 @@
+from collections import deque
+
+
 
 
 class TreeNode:
@@ -6,6 +9,8 @@ class TreeNode:
         self._nodes = []
         self._node_parent = None
         self._can_have_nodes = True
+        # the set of all nodes in this node's tree, shared by all nodes of the tree
+        self._node_index = {self}
 
     def __str__(self):
         return 'TreeNode("%s")' % self._node_name
@@ -38,39 +43,129 @@ class TreeNode:
             raise ValueError("Can not add nodes to %s" % repr(self))
         if not isinstance(node, TreeNode):
             raise TypeError("Can not add non-TreeNode object %s" % type(node))
-        this_nodes = self.node_root.nodes_as_set()
-        if node in this_nodes:
+        if node._node_index is self._node_index:
             raise ValueError("Can not add the same node twice: %s" % repr(node))
-        if this_nodes & node.node_root.nodes_as_set():
-            raise ValueError("Can not add the node because it's tree contains a mutual node")
+        if node._node_parent is not None:
+            raise ValueError("Can not add a node which already has a parent: %s" % repr(node))
         self._nodes.append(node)
         node._node_parent = self
+        self._merge_index(node._node_index)
+
+    def remove_node(self, node):
+        if node not in self._nodes:
+            raise ValueError("%s is not a direct child of %s" % (repr(node), repr(self)))
+        self._nodes.remove(node)
+        node._node_parent = None
+        self._split_index(node)
+
+    def replace_node(self, node, new_node):
+        """
+        Replace the direct child ``node`` with ``new_node`` at the same position
+        """
+        if node not in self._nodes:
+            raise ValueError("%s is not a direct child of %s" % (repr(node), repr(self)))
+        index = self._nodes.index(node)
+        self.remove_node(node)
+        try:
+            self.add_node(new_node)
+        except (TypeError, ValueError):
+            self._nodes.insert(index, node)
+            node._node_parent = self
+            self._merge_index(node._node_index)
+            raise
+        self._nodes.insert(index, self._nodes.pop())
 
     def contains_node(self, node):
-        if node in self._nodes:
+        if node is self or node._node_index is not self._node_index:
+            return False
+        if self._node_parent is None:
             return True
-        for o in self._nodes:
-            if o.contains_node(node):
+        parent = node._node_parent
+        while parent is not None:
+            if parent is self:
                 return True
+            parent = parent._node_parent
         return False
 
     def nodes_as_set(self):
-        s = {self}
-        for o in self._nodes:
-            s |= o.nodes_as_set()
-        return s
+        if self._node_parent is None:
+            return set(self._node_index)
+        return self._collect_nodes()
+
+    def _collect_nodes(self):
+        return set(self.iter_pre_order())
+
+    def _merge_index(self, other_index):
+        """
+        Merge the index of an attached tree into this tree's index,
+        the smaller set is added to the larger one
+        """
+        index = self._node_index
+        if len(index) < len(other_index):
+            index, other_index = other_index, index
+        index |= other_index
+        for node in other_index:
+            node._node_index = index
+
+    def _split_index(self, node):
+        """
+        Move the index entries of the detached sub-tree ``node`` into a new set
+        """
+        index = node._collect_nodes()
+        self._node_index -= index
+        for n in index:
+            n._node_index = index
 
     def nodes_as_level_dict(self, level=0):
-        d = {level: [self,]}
-        for n in self.nodes:
-            sub = n.nodes_as_level_dict(level+1)
-            for l in sub.keys():
-                if not l in d:
-                    d[l] = sub[l]
-                else:
-                    d[l] += sub[l]
+        d = {}
+        queue = deque(((self, level),))
+        while queue:
+            node, lvl = queue.popleft()
+            d.setdefault(lvl, []).append(node)
+            queue.extend((n, lvl + 1) for n in node._nodes)
         return d
 
+    # ------ traversal ------
+    # The iterators keep one entry per tree level (or per open node for level order)
+    # and do not recurse. The tree must not be changed during iteration.
+    # If ``prune(node)`` returns True, the node is yielded but not it's children.
+
+    def iter_pre_order(self, prune=None):
+        """
+        Yields this node and all sub-nodes, each parent before it's children
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node._nodes and not (prune and prune(node)):
+                stack.extend(reversed(node._nodes))
+
+    def iter_post_order(self, prune=None):
+        """
+        Yields all sub-nodes and this node, each parent after it's children
+        """
+        stack = [(self, iter(() if prune and prune(self) else self._nodes))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield node
+            else:
+                stack.append((child, iter(() if prune and prune(child) else child._nodes)))
+
+    def iter_level_order(self, prune=None):
+        """
+        Yields this node and all sub-nodes, level by level
+        """
+        queue = deque((self,))
+        while queue:
+            node = queue.popleft()
+            yield node
+            if node._nodes and not (prune and prune(node)):
+                queue.extend(node._nodes)
+
     def render_node_tree(self, name_func=None):
         """
         Returns a multi-line string with the whole tree rendered in ascii
@@ -97,33 +192,33 @@ class TreeNode:
 
 class TreeNodeVisitor:
 
-    def traverse_depth_first(self, node):
-        for n in node.nodes:
-            self.traverse_depth_first(n)
-        self.visit(node)
+    def traverse_depth_first(self, node, prune=None):
+        for n in node.iter_post_order(prune):
+            self.visit(n)
 
-    def traverse_breath_first(self, node):
+    def traverse_breath_first(self, node, prune=None):
+        """
+        Visits the node, then all it's children and then,
+        for each child, it's children in the same manner
+        """
         self.visit(node)
-        self._traverse_breath_first(node)
-
-    def _traverse_breath_first(self, node):
-        for n in node.nodes:
+        stack = [iter((node,))]
+        while stack:
+            n = next(stack[-1], None)
+            if n is None:
+                stack.pop()
+            elif n.nodes and not (prune and prune(n)):
+                for child in n.nodes:
+                    self.visit(child)
+                stack.append(iter(n.nodes))
+
+    def traverse(self, node, prune=None):
+        for n in node.iter_level_order(prune):
             self.visit(n)
-        for n in node.nodes:
-            self._traverse_breath_first(n)
 
-    def traverse(self, node):
-        d = node.nodes_as_level_dict()
-        for lvl in d:
-            for n in d[lvl]:
-                self.visit(n)
-
-    def traverse_reverse(self, node):
-        d = node.nodes_as_level_dict()
-        for lvl in reversed(list(d)):
-            for n in reversed(d[lvl]):
-                self.visit(n)
+    def traverse_reverse(self, node, prune=None):
+        for n in reversed(list(node.iter_level_order(prune))):
+            self.visit(n)
 
     def visit(self, node):
         raise NotImplementedError
-
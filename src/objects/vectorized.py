@@ -0,0 +1,109 @@
+"""
+Optional NumPy backend which evaluates the distance field
+for an (N, 3) array of points at once.
+
+It is only available if numpy can be imported, see ``HAS_NUMPY``.
+The pure-python methods stay the default.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .node_table import NodeTable
+from ..vec import Vec3, Vec3Array
+from ..vec.types import *
+
+
+HAS_NUMPY = np is not None
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for the vectorized backend")
+
+
+def to_array(vectors: Sequence[Vector3]):
+    """
+    Convert a sequence of Vec3 to an (N, 3) float array
+    """
+    require_numpy()
+    if isinstance(vectors, Vec3Array):
+        return vectors.to_numpy()
+    return np.array([tuple(v) for v in vectors], dtype=np.float64).reshape(-1, 3)
+
+
+def distance_object_array(scene, points, ignore_objects=None):
+    """
+    Evaluate ``scene.distance_object`` for an (N, 3) array of points.
+
+    :return: tuple of (distances, object_indices, NodeTable)
+    """
+    require_numpy()
+    table = NodeTable(scene)
+    distances, indices = scene.distance_object_array(
+        np.asarray(points, dtype=np.float64), table, ignore_objects=ignore_objects,
+    )
+    return distances, indices, table
+
+
+def raymarch_array(
+        scene,
+        origins,
+        directions,
+        max_iter: int = 1000,
+        ignore_objects=None,
+        epsilon: float = 0.0001,
+        cone_angle: float = 0.,
+        max_distance: float = float("inf"),
+):
+    """
+    Vectorized version of ``Base.raymarch_many``.
+
+    :param origins: (N, 3) array
+    :param directions: (N, 3) array
+    :return: tuple of (positions, object_indices, iterations, NodeTable)
+    """
+    require_numpy()
+    table = NodeTable(scene)
+    positions = np.array(origins, dtype=np.float64)
+    directions = np.asarray(directions, dtype=np.float64)
+    travelled = np.zeros(len(positions))
+    indices = np.full(len(positions), -1, dtype=np.int64)
+    iterations = np.full(len(positions), max_iter, dtype=np.int64)
+
+    active = np.arange(len(positions))
+    for it in range(max_iter):
+        if not len(active):
+            break
+
+        d, o = scene.distance_object_array(positions[active], table, ignore_objects=ignore_objects)
+        t = travelled[active]
+
+        hit = d <= epsilon + t * cone_angle
+        indices[active[hit]] = o[hit]
+        iterations[active[hit]] = it + 1
+
+        t = t + d
+        escaped = ~hit & (t > max_distance)
+        iterations[active[escaped]] = it + 1
+
+        keep = ~(hit | escaped)
+        active, d = active[keep], d[keep]
+        travelled[active] = t[keep]
+        positions[active] += d[:, None] * directions[active]
+
+    return positions, indices, iterations, table
+
+
+def empty_result(num: int):
+    """
+    Returns the array equivalent of ``INFINITY, None``
+    """
+    from .base import INFINITY
+    return np.full(num, INFINITY), np.full(num, -1, dtype=np.int64)
+
+
+def length(points):
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    return np.sqrt(x * x + y * y + z * z)
@@ -1,9 +1,10 @@
+import multiprocessing
 import time
-from typing import Callable
+from typing import Callable, List
 
 from .vec import *
 from .objects import *
-from .image import Image
+from .image import Image, SharedImage, ImageSink, ImageTarget
 
 
 class Raymarcher:
@@ -13,15 +14,47 @@ class Raymarcher:
         self.default_material = Color((.5, .5, .5))
         self.background_color = Vec3()
         self.max_reflections = 5
+        # march primary rays with the numpy backend
+        self.vectorized = False
+        # over-relaxation factor of the ray-marching steps, e.g. 1.2 - 1.6
+        self.omega = 1.
+        # rays that travel further are treated as background
+        self.max_distance = 1000.
+        # minimum hit threshold of the ray-marching
+        self.epsilon = 0.0001
+        # grow the hit threshold with the pixel footprint, see ``render``
+        self.adaptive_epsilon = True
+        # hit threshold increase per unit of distance, set by ``render``
+        self.cone_angle = 0.
+        # use ``Base.distance_gradient`` for the surface normals
+        self.analytic_normals = True
+        # reflected rays start this many ``epsilon`` off the surface, along the normal
+        self.surface_offset = 2.
         self.statistics = Statistics()
 
     def render(
             self,
-            image: Image,
+            image: ImageTarget,
             ray_function: Callable,
             aa: int = 0,
             verbose: bool = True,
+            workers: int = 1,
+            tile_size: int = 32,
     ):
+        """
+        Render the scene into ``image``.
+
+        :param image: the target Image, rendered colors are added to it's pixels.
+            Or an ``ImageSink``, which receives bands of ``tile_size`` finished rows
+            from top to bottom, so the whole image never needs to be in memory.
+        :param ray_function: a function receiving a Vec2 in range [-1, 1]
+            and returning a tuple of origin and direction Vec3
+        :param aa: anti-aliasing, number of sub-pixels per axis
+        :param verbose: print progress to stdout
+        :param workers: number of processes, if > 1 the image is split into tiles
+            of ``tile_size`` pixels which are rendered in a process pool
+        :param tile_size: edge length of one tile in pixels
+        """
         self.statistics = Statistics()
         self.statistics.start_time = time.time()
         self.statistics.aa = aa
@@ -29,32 +62,191 @@ class Raymarcher:
         self.statistics.progress_time = time.time()
 
         aa = max(1, aa)
+        tile_size = max(1, tile_size)
+
+        self.cone_angle = 0.
+        if self.adaptive_epsilon:
+            self.cone_angle = .5 * pixel_cone_angle(ray_function, image.width * aa, image.height * aa)
+
+        if isinstance(image, ImageSink):
+            self._render_streaming(image, ray_function, aa, verbose, workers, tile_size)
+
+        else:
+            if workers > 1:
+                # workers write into a SharedImage directly
+                target = image if isinstance(image, SharedImage) else None
+                for x0, y0, tile in self._render_parallel(
+                        image.width, image.height, ray_function, aa, verbose, workers, tile_size,
+                        target=target,
+                ):
+                    if tile is not None:
+                        image.add_tile(x0, y0, tile)
+            else:
+                self._render_tile(image, ray_function, aa, image.width, image.height, 0, 0, verbose)
+
+            if aa > 1:
+                image.scale(1. / (aa * aa))
 
-        for y in range(image.height * aa):
-            norm_y = (y / max(1, image.height * aa - 1) - .5) * -2.
-            for x in range(image.width * aa):
-                norm_x = (x / max(1, image.width * aa - 1) - .5) * 2.
+        self.statistics.end_time = time.time()
+
+    def _render_streaming(
+            self,
+            sink: ImageSink,
+            ray_function: Callable,
+            aa: int,
+            verbose: bool,
+            workers: int,
+            tile_size: int,
+    ):
+        """
+        Render bands of ``tile_size`` rows and pass them to the sink in order
+        """
+        width, height = sink.width, sink.height
+
+        def write_band(y0: int, band: Image):
+            if aa > 1:
+                band.scale(1. / (aa * aa))
+            sink.write_rows(y0, band)
+
+        if workers <= 1:
+            for y0 in range(0, height, tile_size):
+                band = Image(width, min(tile_size, height - y0))
+                self._render_tile(band, ray_function, aa, width, height, 0, y0, verbose)
+                write_band(y0, band)
+            return
+
+        num_band_tiles = (width + tile_size - 1) // tile_size
+        # y0 -> [band Image, number of missing tiles]
+        bands = {}
+        next_y = 0
+        for x0, y0, tile in self._render_parallel(width, height, ray_function, aa, verbose, workers, tile_size):
+            if y0 not in bands:
+                bands[y0] = [Image(width, tile.height), num_band_tiles]
+            bands[y0][0].add_tile(x0, 0, tile)
+            bands[y0][1] -= 1
+
+            while next_y in bands and not bands[next_y][1]:
+                write_band(next_y, bands.pop(next_y)[0])
+                next_y += tile_size
+
+    def _render_tile(
+            self,
+            tile: Image,
+            ray_function: Callable,
+            aa: int,
+            width: int,
+            height: int,
+            x0: int,
+            y0: int,
+            verbose: bool,
+    ):
+        """
+        Render the (sub-)pixels of one tile of an image of size ``width`` x ``height``.
+
+        The tile covers the pixels starting at ``x0``, ``y0`` and has the size of ``tile``.
+        Colors are accumulated into ``tile`` but not divided by the number of sub-pixels.
+        """
+        for y in range(y0 * aa, (y0 + tile.height) * aa):
+            norm_y = (y / max(1, height * aa - 1) - .5) * -2.
+            pixels = tile.pixels
+            row_offset = (y // aa - y0) * tile.width * 3
+
+            if self.vectorized:
+                # converted to numpy without a python object per vector
+                origins, directions = Vec3Array(), Vec3Array()
+            else:
+                origins, directions = [], []
+            for x in range(x0 * aa, (x0 + tile.width) * aa):
+                norm_x = (x / max(1, width * aa - 1) - .5) * 2.
 
                 origin, direction = ray_function(Vec2(norm_x, norm_y))
-                col = self._get_ray_color(origin, direction, self.max_reflections)
-                image.data[y // aa][x // aa] += col
+                origins.append(origin)
+                directions.append(direction)
+
+            colors = self._get_ray_colors(origins, directions, self.max_reflections)
+            for x, (r, g, b) in enumerate(colors):
+                i = row_offset + x // aa * 3
+                pixels[i] += r
+                pixels[i + 1] += g
+                pixels[i + 2] += b
 
-                self.statistics.num_pixel_casts += 1
+            self.statistics.num_pixel_casts += len(colors)
+
+            if verbose:
+                ti = time.time()
+                if ti - self.statistics.progress_time >= 1.:
+                    self.statistics._dump_verbose(ti)
+
+    def _render_parallel(
+            self,
+            width: int,
+            height: int,
+            ray_function: Callable,
+            aa: int,
+            verbose: bool,
+            workers: int,
+            tile_size: int,
+            target: SharedImage = None,
+    ):
+        """
+        Render tiles in a process pool.
+
+        :param target: optional SharedImage, the workers add their tiles to it
+        :return: generator of tuples (x0, y0, tile Image) in order of completion,
+            the tile is None if it has been added to ``target``
+        """
+        tiles = [
+            (x, y, min(tile_size, width - x), min(tile_size, height - y))
+            for y in range(0, height, tile_size)
+            for x in range(0, width, tile_size)
+        ]
+
+        # 'fork' let's the workers inherit the scene and ray_function without pickling
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+
+        with context.Pool(
+                workers,
+                initializer=_init_render_worker,
+                initargs=(self, ray_function, aa, width, height, target),
+        ) as pool:
+            for x0, y0, tile, statistics in pool.imap_unordered(_render_worker_tile, tiles):
+                self.statistics.merge(statistics)
+
+                yield x0, y0, tile
 
                 if verbose:
                     ti = time.time()
                     if ti - self.statistics.progress_time >= 1.:
                         self.statistics._dump_verbose(ti)
 
-        if aa > 1:
-            fac = 1. / (aa * aa)
-            image.map(lambda c: c * fac)
-
-        self.statistics.end_time = time.time()
-
-    def _get_ray_color(self, origin: Vec3, direction: Vec3, max_reflections: int, ignore_objects=None):
-        pos, obj = self.scene.raymarch(origin, direction, ignore_objects=ignore_objects)
+    def _get_ray_colors(self, origins: List[Vec3], directions: List[Vec3], max_reflections: int):
+        """
+        Color of a packet of rays, marched together through ``Base.raymarch_many``
+        """
+        positions, objects, iterations = self.scene.raymarch_many(
+            origins, directions, vectorized=self.vectorized, omega=self.omega,
+            epsilon=self.epsilon, cone_angle=self.cone_angle, max_distance=self.max_distance,
+        )
+        self.statistics.num_rays += len(positions)
+        self.statistics.num_march_steps += sum(iterations)
+
+        return [
+            self._get_object_color(obj, pos, direction, max_reflections)
+            if obj else self.background_color
+            for pos, obj, direction in zip(positions, objects, directions)
+        ]
+
+    def _get_ray_color(self, origin: Vec3, direction: Vec3, max_reflections: int):
+        positions, objects, iterations = self.scene.raymarch_many(
+            [origin], [direction], omega=self.omega,
+            epsilon=self.epsilon, cone_angle=self.cone_angle, max_distance=self.max_distance,
+        )
+        pos, obj = positions[0], objects[0]
         self.statistics.num_rays += 1
+        self.statistics.num_march_steps += iterations[0]
 
         if obj:
             return self._get_object_color(obj, pos, direction, max_reflections)
@@ -81,41 +273,80 @@ class Raymarcher:
 
             color = getattr(m, "color", None)
             if color is not None:
-                color_sum += color
+                color_sum.iadd_vec(color)
                 amt_sum += amt
 
             reflective = getattr(m, "reflective", None)
             if reflective and max_reflections > 0:
-                color = self._get_reflect_ray_color(
-                    obj, global_pos, local_pos, ray_direction, max_reflections - 1
-                )
-                color_sum += color
+                color = self._get_reflect_ray_color(global_pos, ray_direction, max_reflections - 1)
+                color_sum.iadd_vec(color)
                 amt_sum += reflective
 
         if amt_sum:
-            color_sum /= amt_sum
+            color_sum.idiv_scalar(amt_sum)
 
         return color_sum
 
     def _get_reflect_ray_color(
             self,
-            obj: Base,
             global_pos: Vec3,
-            local_pos: Vec3,
             ray_direction: Vec3,
             max_reflections: int,
     ):
         self.statistics.num_reflections += 1
 
-        normal = self.scene.normal(global_pos)
+        normal = self.scene.normal(global_pos, analytic=self.analytic_normals)
         direction = ray_direction.reflected(normal)
-        return self._get_ray_color(
-            local_pos,
-            direction,
-            max_reflections=max_reflections,
-            ignore_objects={obj},
-        )
+        # start off the surface, instead of ignoring the hit object,
+        # so the plain distance path is used and concave objects can reflect themselves
+        origin = global_pos.madd(normal, self.surface_offset * self.epsilon)
+        return self._get_ray_color(origin, direction, max_reflections=max_reflections)
+
+
+def pixel_cone_angle(ray_function: Callable, width: int, height: int) -> float:
+    """
+    Estimate the angle (in radians) between the rays of two neighbouring pixels.
+
+    The rays at the center of the image are compared,
+    which is zero for orthographic projections.
+    """
+    step_x = 2. / max(1, width - 1)
+    step_y = 2. / max(1, height - 1)
+    direction = ray_function(Vec2(0, 0))[1].copy().normalize_safe()
+    direction_x = ray_function(Vec2(step_x, 0))[1].copy().normalize_safe()
+    direction_y = ray_function(Vec2(0, step_y))[1].copy().normalize_safe()
+    return max(direction.distance(direction_x), direction.distance(direction_y))
+
 
+_worker_state = None
+
+
+def _init_render_worker(
+        raymarcher: Raymarcher,
+        ray_function: Callable,
+        aa: int,
+        width: int,
+        height: int,
+        target: SharedImage = None,
+):
+    global _worker_state
+    _worker_state = (raymarcher, ray_function, aa, width, height, target)
+
+
+def _render_worker_tile(tile):
+    raymarcher, ray_function, aa, width, height, target = _worker_state
+    x0, y0, tile_width, tile_height = tile
+
+    raymarcher.statistics = Statistics()
+    image = Image(tile_width, tile_height)
+    raymarcher._render_tile(image, ray_function, aa, width, height, x0, y0, verbose=False)
+
+    if target is not None:
+        # tiles do not overlap, so no locking is needed
+        target.add_tile(x0, y0, image)
+        image = None
+
+    return x0, y0, image, raymarcher.statistics
 
 
 class Statistics:
@@ -127,11 +358,21 @@ class Statistics:
         self.last_progress_time = 0.
         self.last_num_pixel_casts = 0
         self.num_rays = 0
+        self.num_march_steps = 0
         self.num_pixels = 0
         self.num_pixel_casts = 0
         self.num_reflections = 0
         self.aa = 1
 
+    def merge(self, other: "Statistics"):
+        """
+        Add the counters of another Statistics instance, e.g. from a worker process
+        """
+        self.num_rays += other.num_rays
+        self.num_march_steps += other.num_march_steps
+        self.num_pixel_casts += other.num_pixel_casts
+        self.num_reflections += other.num_reflections
+
     def dump(self):
         num_pix = max(1, self.num_pixels)
         seconds = self.end_time - self.start_time
@@ -144,6 +385,8 @@ class Statistics:
             f"number of rays        : {self.num_rays}"
             f", {self.num_rays / num_pix:0.2f}/pixel"
             f", {self.num_rays * per_sec:0.2f}/sec\n"
+            f"number of march steps : {self.num_march_steps}"
+            f", {self.num_march_steps / max(1, self.num_rays):0.2f}/ray\n"
             f"number of reflections : {self.num_reflections}"
             f", {self.num_reflections / num_pix:0.3f}/pixel\n"
         )
@@ -1,2 +1,3 @@
 from .vec2 import Vec2
 from .vec3 import Vec3
+from .vec_array import Vec2Array, Vec3Array
@@ -1,6 +1,7 @@
 """
 Generates somewhat fast methods for operator overloading
 """
+import os
 
 
 FUNCTIONS = {
@@ -33,13 +34,55 @@ FUNCTIONS = {
     ],
 }
 
+# type-specialized variants without isinstance checks,
+# e.g. add_vec(Vec3), add_scalar(float), iadd_vec(Vec3), iadd_scalar(float)
+TYPED_FUNCTIONS = [
+    {"name": "add", "func_str": "{} + {}"},
+    {"name": "sub", "func_str": "{} - {}"},
+    {"name": "mul", "func_str": "{} * {}"},
+    {"name": "div", "func_str": "{} / {}"},
+    {"name": "mod", "func_str": "{} % {}"},
+]
+
+# other straight-line operations, "args" are the arguments besides self,
+# "{0}" in func_str is the component of self, "{1}", "{2}", .. the arguments.
+# Vector arguments are indexed per component.
+# ``dot`` and ``length`` are already written by hand in vec2.py / vec3.py
+HOT_FUNCTIONS = [
+    {
+        "name": "lerp", "args": [("vec", "vec"), ("t", "scalar")],
+        "func_str": "{0} + ({1} - {0}) * {2}",
+        "doc": "Linear interpolation between self (t=0) and vec (t=1)",
+    },
+    {
+        "name": "madd", "args": [("vec", "vec"), ("s", "scalar")],
+        "func_str": "{0} + {1} * {2}",
+        "doc": "Multiply-add: self + vec * s",
+    },
+    {
+        "name": "min_vec", "args": [("vec", "vec")],
+        "func_str": "{1} if {1} < {0} else {0}",
+        "doc": "Component-wise minimum",
+    },
+    {
+        "name": "max_vec", "args": [("vec", "vec")],
+        "func_str": "{1} if {1} > {0} else {0}",
+        "doc": "Component-wise maximum",
+    },
+    {
+        "name": "clamp", "args": [("lo", "scalar"), ("hi", "scalar")],
+        "func_str": "{1} if {0} < {1} else {2} if {0} > {2} else {0}",
+        "doc": "Clamp each component to the range [lo, hi]",
+    },
+]
+
 
 INDENT = "    "
 
 
 def render_unary_func(name: str, func_str: str, num: int):
     code = f"{INDENT}def {name}(self):\n"
-    code += f"{INDENT*2}return self.__class__(\n"
+    code += f"{INDENT*2}return self._from_floats(\n"
     for i in range(num):
         code += f"{INDENT*3}{func_str.format(f'self._v[{i}]')},\n"
     code += f"{INDENT*2})\n"
@@ -50,7 +93,7 @@ def render_binary_func(name: str, func_str: str, num: int, reverse: bool = False
     code = f"{INDENT}def {name}(self, arg):\n"
 
     code += f"{INDENT*2}if isinstance(arg, (int, float)):\n"
-    code += f"{INDENT*3}return self.__class__(\n"
+    code += f"{INDENT*3}return self._from_floats(\n"
     for i in range(num):
         args = (f"self._v[{i}]", f"arg")
         op = func_str.format(*(reversed(args) if reverse else args))
@@ -58,13 +101,14 @@ def render_binary_func(name: str, func_str: str, num: int, reverse: bool = False
     code += f"{INDENT*3})\n"
 
     code += f"{INDENT*2}elif isinstance(arg, self.__class__):\n"
-    code += f"{INDENT*3}return self.__class__(\n"
+    code += f"{INDENT*3}return self._from_floats(\n"
     for i in range(num):
         args = (f"self._v[{i}]", f"arg._v[{i}]")
         op = func_str.format(*(reversed(args) if reverse else args))
         code += f"{INDENT*4}{op},\n"
     code += f"{INDENT*3})\n"
 
+    # other sequences go through the full constructor, which converts to float
     code += f"{INDENT*2}else:\n"
     code += f"{INDENT*3}return self.__class__(\n"
     for i in range(num):
@@ -101,11 +145,47 @@ def render_binary_inplace_func(name: str, func_str: str, num: int):
     return code
 
 
+def render_typed_func(name: str, func_str: str, num: int, vector: bool, inplace: bool):
+    code = f"{INDENT}def {name}(self, arg):\n"
+    args = [
+        (f"self._v[{i}]", f"arg._v[{i}]" if vector else "arg")
+        for i in range(num)
+    ]
+    if inplace:
+        for i in range(num):
+            code += f"{INDENT*2}self._v[{i}] = {func_str.format(*args[i])}\n"
+        code += f"{INDENT*2}return self\n"
+    else:
+        code += f"{INDENT*2}return self._from_floats(\n"
+        for i in range(num):
+            code += f"{INDENT*3}{func_str.format(*args[i])},\n"
+        code += f"{INDENT*2})\n"
+    return code
+
+
+def render_hot_func(name: str, args: list, func_str: str, doc: str, num: int):
+    code = f"{INDENT}def {name}(self, {', '.join(a[0] for a in args)}):\n"
+    code += f'{INDENT*2}"""{doc}"""\n'
+    for arg_name, arg_type in args:
+        if arg_type == "vec":
+            code += f"{INDENT*2}{arg_name} = {arg_name}._v\n"
+    code += f"{INDENT*2}v = self._v\n"
+    code += f"{INDENT*2}return self._from_floats(\n"
+    for i in range(num):
+        values = [f"v[{i}]"] + [
+            f"{arg_name}[{i}]" if arg_type == "vec" else arg_name
+            for arg_name, arg_type in args
+        ]
+        code += f"{INDENT*3}{func_str.format(*values)},\n"
+    code += f"{INDENT*2})\n"
+    return code
+
 
 def render_file(filename: str, class_name: str, vector_length: int):
-    code = f"# autogenerated by {__file__}\n\n"
+    code = f"# autogenerated by {os.path.basename(__file__)}\n\n"
 
     code += f"\nclass {class_name}:\n\n"
+    code += f"{INDENT}__slots__ = ()\n\n"
     for num_args, functions in FUNCTIONS.items():
         for func in functions:
             if num_args == 1:
@@ -122,6 +202,17 @@ def render_file(filename: str, class_name: str, vector_length: int):
 
             code += "\n"
 
+    for func in TYPED_FUNCTIONS:
+        for inplace in (False, True):
+            for vector in (True, False):
+                name = ("i" if inplace else "") + func["name"] + ("_vec" if vector else "_scalar")
+                code += render_typed_func(name, func["func_str"], vector_length, vector, inplace)
+                code += "\n"
+
+    for func in HOT_FUNCTIONS:
+        code += render_hot_func(func["name"], func["args"], func["func_str"], func["doc"], vector_length)
+        code += "\n"
+
     with open(filename, "w") as fp:
         fp.write(code)
 
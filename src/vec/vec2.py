@@ -6,8 +6,14 @@ from .types import *
 from .vec2_operators import Vec2Operators
 
 
+# bypasses __init__ in ``_from_floats``
+_new = object.__new__
+
+
 class Vec2(Vec2Operators):
 
+    __slots__ = ("_v",)
+
     def __init__(
             self,
             x: Union[Vector2, Number] = None,
@@ -45,6 +51,17 @@ class Vec2(Vec2Operators):
             else:
                 self._v = [float(x), float(y)]
 
+    @classmethod
+    def _from_floats(cls, x, y):
+        """
+        Creates a new Vec2 from floats without any conversion or validation.
+
+        For internal use, e.g. in the generated operators.
+        """
+        vec = _new(cls)
+        vec._v = [x, y]
+        return vec
+
     def __repr__(self):
         return "%s(%s, %s)" % (self.__class__.__name__, self.x, self.y)
 
@@ -72,21 +89,23 @@ class Vec2(Vec2Operators):
             x: Union[Vector2, Number] = None,
             y: Optional[Number] = None,
     ):
+        v = self._v
         if x is None:
-            self._v = [0., 0.]
+            v[0] = v[1] = 0.
         else:
             if y is None:
                 if isinstance(x, (int, float)):
-                    self._v = [x, x]
+                    v[0] = v[1] = x
                 else:
-                    self._v = [x[0], x[1]]
+                    v[0], v[1] = x[0], x[1]
             else:
-                self._v = [x, y]
+                v[0], v[1] = x, y
+        return self
 
     # --- copy ---
 
     def __copy__(self):
-        return self.__class__(self._v[0], self._v[1])
+        return self._from_floats(self._v[0], self._v[1])
 
     def copy(self):
         return self.__copy__()
@@ -99,8 +118,8 @@ class Vec2(Vec2Operators):
     def __getitem__(self, i: int):
         return self._v[i]
 
-    def __setitem__(self, i: int):
-        return self._v[i]
+    def __setitem__(self, i: int, x: Number):
+        self._v[i] = x
 
     def __iter__(self):
         return iter(self._v)
@@ -209,6 +228,39 @@ class Vec2(Vec2Operators):
 
     # ------ inplace methods -------
 
+    def add_scaled(self, vec2: Vector2, scale: Number):
+        """
+        Adds ``vec2 * scale`` to this vector INPLACE, without a temporary vector
+
+        :param vec2: float sequence of length 2
+        :param scale: a number
+        :return: self
+
+        >>> Vec2(1, 2).add_scaled((1, -1), 2)
+        Vec2(3.0, 0.0)
+        """
+        v = self._v
+        v[0] += vec2[0] * scale
+        v[1] += vec2[1] * scale
+        return self
+
+    def sub_into(self, vec2: Vector2, out: "Vec2"):
+        """
+        Stores ``self - vec2`` in ``out``, without a temporary vector
+
+        :param vec2: float sequence of length 2
+        :param out: the Vec2 to store the result in
+        :return: out
+
+        >>> Vec2(1, 2).sub_into((1, 1), Vec2())
+        Vec2(0.0, 1.0)
+        """
+        v = self._v
+        o = out._v
+        o[0] = v[0] - vec2[0]
+        o[1] = v[1] - vec2[1]
+        return out
+
     def round(self, n: Optional[int] = None):
         """
         Rounds the vector INPLACE
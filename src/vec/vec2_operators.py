@@ -3,26 +3,28 @@
 
 class Vec2Operators:
 
+    __slots__ = ()
+
     def __abs__(self):
-        return self.__class__(
+        return self._from_floats(
             abs(self._v[0]),
             abs(self._v[1]),
         )
 
     def __neg__(self):
-        return self.__class__(
+        return self._from_floats(
             -self._v[0],
             -self._v[1],
         )
 
     def __add__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] + arg,
                 self._v[1] + arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] + arg._v[0],
                 self._v[1] + arg._v[1],
             )
@@ -34,12 +36,12 @@ class Vec2Operators:
 
     def __radd__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg + self._v[0],
                 arg + self._v[1],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] + self._v[0],
                 arg._v[1] + self._v[1],
             )
@@ -62,12 +64,12 @@ class Vec2Operators:
         return self
     def __sub__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] - arg,
                 self._v[1] - arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] - arg._v[0],
                 self._v[1] - arg._v[1],
             )
@@ -79,12 +81,12 @@ class Vec2Operators:
 
     def __rsub__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg - self._v[0],
                 arg - self._v[1],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] - self._v[0],
                 arg._v[1] - self._v[1],
             )
@@ -107,12 +109,12 @@ class Vec2Operators:
         return self
     def __mul__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] * arg,
                 self._v[1] * arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] * arg._v[0],
                 self._v[1] * arg._v[1],
             )
@@ -124,12 +126,12 @@ class Vec2Operators:
 
     def __rmul__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg * self._v[0],
                 arg * self._v[1],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] * self._v[0],
                 arg._v[1] * self._v[1],
             )
@@ -152,12 +154,12 @@ class Vec2Operators:
         return self
     def __truediv__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] / arg,
                 self._v[1] / arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] / arg._v[0],
                 self._v[1] / arg._v[1],
             )
@@ -169,12 +171,12 @@ class Vec2Operators:
 
     def __rtruediv__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg / self._v[0],
                 arg / self._v[1],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] / self._v[0],
                 arg._v[1] / self._v[1],
             )
@@ -197,12 +199,12 @@ class Vec2Operators:
         return self
     def __mod__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] % arg,
                 self._v[1] % arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] % arg._v[0],
                 self._v[1] % arg._v[1],
             )
@@ -214,12 +216,12 @@ class Vec2Operators:
 
     def __rmod__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg % self._v[0],
                 arg % self._v[1],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] % self._v[0],
                 arg._v[1] % self._v[1],
             )
@@ -240,3 +242,157 @@ class Vec2Operators:
             self._v[0] = self._v[0] % arg[0]
             self._v[1] = self._v[1] % arg[1]
         return self
+    def add_vec(self, arg):
+        return self._from_floats(
+            self._v[0] + arg._v[0],
+            self._v[1] + arg._v[1],
+        )
+
+    def add_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] + arg,
+            self._v[1] + arg,
+        )
+
+    def iadd_vec(self, arg):
+        self._v[0] = self._v[0] + arg._v[0]
+        self._v[1] = self._v[1] + arg._v[1]
+        return self
+
+    def iadd_scalar(self, arg):
+        self._v[0] = self._v[0] + arg
+        self._v[1] = self._v[1] + arg
+        return self
+
+    def sub_vec(self, arg):
+        return self._from_floats(
+            self._v[0] - arg._v[0],
+            self._v[1] - arg._v[1],
+        )
+
+    def sub_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] - arg,
+            self._v[1] - arg,
+        )
+
+    def isub_vec(self, arg):
+        self._v[0] = self._v[0] - arg._v[0]
+        self._v[1] = self._v[1] - arg._v[1]
+        return self
+
+    def isub_scalar(self, arg):
+        self._v[0] = self._v[0] - arg
+        self._v[1] = self._v[1] - arg
+        return self
+
+    def mul_vec(self, arg):
+        return self._from_floats(
+            self._v[0] * arg._v[0],
+            self._v[1] * arg._v[1],
+        )
+
+    def mul_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] * arg,
+            self._v[1] * arg,
+        )
+
+    def imul_vec(self, arg):
+        self._v[0] = self._v[0] * arg._v[0]
+        self._v[1] = self._v[1] * arg._v[1]
+        return self
+
+    def imul_scalar(self, arg):
+        self._v[0] = self._v[0] * arg
+        self._v[1] = self._v[1] * arg
+        return self
+
+    def div_vec(self, arg):
+        return self._from_floats(
+            self._v[0] / arg._v[0],
+            self._v[1] / arg._v[1],
+        )
+
+    def div_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] / arg,
+            self._v[1] / arg,
+        )
+
+    def idiv_vec(self, arg):
+        self._v[0] = self._v[0] / arg._v[0]
+        self._v[1] = self._v[1] / arg._v[1]
+        return self
+
+    def idiv_scalar(self, arg):
+        self._v[0] = self._v[0] / arg
+        self._v[1] = self._v[1] / arg
+        return self
+
+    def mod_vec(self, arg):
+        return self._from_floats(
+            self._v[0] % arg._v[0],
+            self._v[1] % arg._v[1],
+        )
+
+    def mod_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] % arg,
+            self._v[1] % arg,
+        )
+
+    def imod_vec(self, arg):
+        self._v[0] = self._v[0] % arg._v[0]
+        self._v[1] = self._v[1] % arg._v[1]
+        return self
+
+    def imod_scalar(self, arg):
+        self._v[0] = self._v[0] % arg
+        self._v[1] = self._v[1] % arg
+        return self
+
+    def lerp(self, vec, t):
+        """Linear interpolation between self (t=0) and vec (t=1)"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            v[0] + (vec[0] - v[0]) * t,
+            v[1] + (vec[1] - v[1]) * t,
+        )
+
+    def madd(self, vec, s):
+        """Multiply-add: self + vec * s"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            v[0] + vec[0] * s,
+            v[1] + vec[1] * s,
+        )
+
+    def min_vec(self, vec):
+        """Component-wise minimum"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            vec[0] if vec[0] < v[0] else v[0],
+            vec[1] if vec[1] < v[1] else v[1],
+        )
+
+    def max_vec(self, vec):
+        """Component-wise maximum"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            vec[0] if vec[0] > v[0] else v[0],
+            vec[1] if vec[1] > v[1] else v[1],
+        )
+
+    def clamp(self, lo, hi):
+        """Clamp each component to the range [lo, hi]"""
+        v = self._v
+        return self._from_floats(
+            lo if v[0] < lo else hi if v[0] > hi else v[0],
+            lo if v[1] < lo else hi if v[1] > hi else v[1],
+        )
+
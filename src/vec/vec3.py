@@ -6,8 +6,14 @@ from .types import *
 from .vec3_operators import Vec3Operators
 
 
+# bypasses __init__ in ``_from_floats``
+_new = object.__new__
+
+
 class Vec3(Vec3Operators):
 
+    __slots__ = ("_v",)
+
     def __init__(
             self,
             x: Union[Vector3, Number] = None,
@@ -44,6 +50,17 @@ class Vec3(Vec3Operators):
             else:
                 self._v = [float(x), float(y), float(z or 0.)]
 
+    @classmethod
+    def _from_floats(cls, x, y, z):
+        """
+        Creates a new Vec3 from floats without any conversion or validation.
+
+        For internal use, e.g. in the generated operators.
+        """
+        vec = _new(cls)
+        vec._v = [x, y, z]
+        return vec
+
     def __repr__(self):
         return "%s(%s, %s, %s)" % (self.__class__.__name__, self.x, self.y, self.z)
 
@@ -80,18 +97,20 @@ class Vec3(Vec3Operators):
             y: Optional[Number] = None,
             z: Optional[Number] = None,
     ):
+        v = self._v
         if x is None:
-            self._v = [0., 0., 0.]
+            v[0] = v[1] = v[2] = 0.
         else:
             if y is None:
-                self._v = [x[0], x[1], x[2]]
+                v[0], v[1], v[2] = x[0], x[1], x[2]
             else:
-                self._v = [x, y, z or 0.]
+                v[0], v[1], v[2] = x, y, z or 0.
+        return self
 
     # --- copy ---
 
     def __copy__(self):
-        return self.__class__(self.x, self.y, self.z)
+        return self._from_floats(self._v[0], self._v[1], self._v[2])
 
     def copy(self):
         return self.__copy__()
@@ -104,8 +123,8 @@ class Vec3(Vec3Operators):
     def __getitem__(self, i: int):
         return self._v[i]
 
-    def __setitem__(self, i: int):
-        return self._v[i]
+    def __setitem__(self, i: int, x: Number):
+        self._v[i] = x
 
     def __iter__(self):
         return iter(self._v)
@@ -219,6 +238,41 @@ class Vec3(Vec3Operators):
 
     # ------ inplace methods -------
 
+    def add_scaled(self, vec3: Vector3, scale: Number):
+        """
+        Adds ``vec3 * scale`` to this vector INPLACE, without a temporary vector
+
+        :param vec3: float sequence of length 3
+        :param scale: a number
+        :return: self
+
+        >>> Vec3(1, 2, 3).add_scaled((1, 0, -1), 2)
+        Vec3(3.0, 2.0, 1.0)
+        """
+        v = self._v
+        v[0] += vec3[0] * scale
+        v[1] += vec3[1] * scale
+        v[2] += vec3[2] * scale
+        return self
+
+    def sub_into(self, vec3: Vector3, out: "Vec3"):
+        """
+        Stores ``self - vec3`` in ``out``, without a temporary vector
+
+        :param vec3: float sequence of length 3
+        :param out: the Vec3 to store the result in
+        :return: out
+
+        >>> Vec3(1, 2, 3).sub_into((1, 1, 1), Vec3())
+        Vec3(0.0, 1.0, 2.0)
+        """
+        v = self._v
+        o = out._v
+        o[0] = v[0] - vec3[0]
+        o[1] = v[1] - vec3[1]
+        o[2] = v[2] - vec3[2]
+        return out
+
     def round(self, n: Optional[int] = None):
         """
         Rounds the vector INPLACE
@@ -3,15 +3,17 @@
 
 class Vec3Operators:
 
+    __slots__ = ()
+
     def __abs__(self):
-        return self.__class__(
+        return self._from_floats(
             abs(self._v[0]),
             abs(self._v[1]),
             abs(self._v[2]),
         )
 
     def __neg__(self):
-        return self.__class__(
+        return self._from_floats(
             -self._v[0],
             -self._v[1],
             -self._v[2],
@@ -19,13 +21,13 @@ class Vec3Operators:
 
     def __add__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] + arg,
                 self._v[1] + arg,
                 self._v[2] + arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] + arg._v[0],
                 self._v[1] + arg._v[1],
                 self._v[2] + arg._v[2],
@@ -39,13 +41,13 @@ class Vec3Operators:
 
     def __radd__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg + self._v[0],
                 arg + self._v[1],
                 arg + self._v[2],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] + self._v[0],
                 arg._v[1] + self._v[1],
                 arg._v[2] + self._v[2],
@@ -73,13 +75,13 @@ class Vec3Operators:
         return self
     def __sub__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] - arg,
                 self._v[1] - arg,
                 self._v[2] - arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] - arg._v[0],
                 self._v[1] - arg._v[1],
                 self._v[2] - arg._v[2],
@@ -93,13 +95,13 @@ class Vec3Operators:
 
     def __rsub__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg - self._v[0],
                 arg - self._v[1],
                 arg - self._v[2],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] - self._v[0],
                 arg._v[1] - self._v[1],
                 arg._v[2] - self._v[2],
@@ -127,13 +129,13 @@ class Vec3Operators:
         return self
     def __mul__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] * arg,
                 self._v[1] * arg,
                 self._v[2] * arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] * arg._v[0],
                 self._v[1] * arg._v[1],
                 self._v[2] * arg._v[2],
@@ -147,13 +149,13 @@ class Vec3Operators:
 
     def __rmul__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg * self._v[0],
                 arg * self._v[1],
                 arg * self._v[2],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] * self._v[0],
                 arg._v[1] * self._v[1],
                 arg._v[2] * self._v[2],
@@ -181,13 +183,13 @@ class Vec3Operators:
         return self
     def __truediv__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] / arg,
                 self._v[1] / arg,
                 self._v[2] / arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] / arg._v[0],
                 self._v[1] / arg._v[1],
                 self._v[2] / arg._v[2],
@@ -201,13 +203,13 @@ class Vec3Operators:
 
     def __rtruediv__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg / self._v[0],
                 arg / self._v[1],
                 arg / self._v[2],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] / self._v[0],
                 arg._v[1] / self._v[1],
                 arg._v[2] / self._v[2],
@@ -235,13 +237,13 @@ class Vec3Operators:
         return self
     def __mod__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] % arg,
                 self._v[1] % arg,
                 self._v[2] % arg,
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 self._v[0] % arg._v[0],
                 self._v[1] % arg._v[1],
                 self._v[2] % arg._v[2],
@@ -255,13 +257,13 @@ class Vec3Operators:
 
     def __rmod__(self, arg):
         if isinstance(arg, (int, float)):
-            return self.__class__(
+            return self._from_floats(
                 arg % self._v[0],
                 arg % self._v[1],
                 arg % self._v[2],
             )
         elif isinstance(arg, self.__class__):
-            return self.__class__(
+            return self._from_floats(
                 arg._v[0] % self._v[0],
                 arg._v[1] % self._v[1],
                 arg._v[2] % self._v[2],
@@ -287,3 +289,182 @@ class Vec3Operators:
             self._v[1] = self._v[1] % arg[1]
             self._v[2] = self._v[2] % arg[2]
         return self
+    def add_vec(self, arg):
+        return self._from_floats(
+            self._v[0] + arg._v[0],
+            self._v[1] + arg._v[1],
+            self._v[2] + arg._v[2],
+        )
+
+    def add_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] + arg,
+            self._v[1] + arg,
+            self._v[2] + arg,
+        )
+
+    def iadd_vec(self, arg):
+        self._v[0] = self._v[0] + arg._v[0]
+        self._v[1] = self._v[1] + arg._v[1]
+        self._v[2] = self._v[2] + arg._v[2]
+        return self
+
+    def iadd_scalar(self, arg):
+        self._v[0] = self._v[0] + arg
+        self._v[1] = self._v[1] + arg
+        self._v[2] = self._v[2] + arg
+        return self
+
+    def sub_vec(self, arg):
+        return self._from_floats(
+            self._v[0] - arg._v[0],
+            self._v[1] - arg._v[1],
+            self._v[2] - arg._v[2],
+        )
+
+    def sub_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] - arg,
+            self._v[1] - arg,
+            self._v[2] - arg,
+        )
+
+    def isub_vec(self, arg):
+        self._v[0] = self._v[0] - arg._v[0]
+        self._v[1] = self._v[1] - arg._v[1]
+        self._v[2] = self._v[2] - arg._v[2]
+        return self
+
+    def isub_scalar(self, arg):
+        self._v[0] = self._v[0] - arg
+        self._v[1] = self._v[1] - arg
+        self._v[2] = self._v[2] - arg
+        return self
+
+    def mul_vec(self, arg):
+        return self._from_floats(
+            self._v[0] * arg._v[0],
+            self._v[1] * arg._v[1],
+            self._v[2] * arg._v[2],
+        )
+
+    def mul_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] * arg,
+            self._v[1] * arg,
+            self._v[2] * arg,
+        )
+
+    def imul_vec(self, arg):
+        self._v[0] = self._v[0] * arg._v[0]
+        self._v[1] = self._v[1] * arg._v[1]
+        self._v[2] = self._v[2] * arg._v[2]
+        return self
+
+    def imul_scalar(self, arg):
+        self._v[0] = self._v[0] * arg
+        self._v[1] = self._v[1] * arg
+        self._v[2] = self._v[2] * arg
+        return self
+
+    def div_vec(self, arg):
+        return self._from_floats(
+            self._v[0] / arg._v[0],
+            self._v[1] / arg._v[1],
+            self._v[2] / arg._v[2],
+        )
+
+    def div_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] / arg,
+            self._v[1] / arg,
+            self._v[2] / arg,
+        )
+
+    def idiv_vec(self, arg):
+        self._v[0] = self._v[0] / arg._v[0]
+        self._v[1] = self._v[1] / arg._v[1]
+        self._v[2] = self._v[2] / arg._v[2]
+        return self
+
+    def idiv_scalar(self, arg):
+        self._v[0] = self._v[0] / arg
+        self._v[1] = self._v[1] / arg
+        self._v[2] = self._v[2] / arg
+        return self
+
+    def mod_vec(self, arg):
+        return self._from_floats(
+            self._v[0] % arg._v[0],
+            self._v[1] % arg._v[1],
+            self._v[2] % arg._v[2],
+        )
+
+    def mod_scalar(self, arg):
+        return self._from_floats(
+            self._v[0] % arg,
+            self._v[1] % arg,
+            self._v[2] % arg,
+        )
+
+    def imod_vec(self, arg):
+        self._v[0] = self._v[0] % arg._v[0]
+        self._v[1] = self._v[1] % arg._v[1]
+        self._v[2] = self._v[2] % arg._v[2]
+        return self
+
+    def imod_scalar(self, arg):
+        self._v[0] = self._v[0] % arg
+        self._v[1] = self._v[1] % arg
+        self._v[2] = self._v[2] % arg
+        return self
+
+    def lerp(self, vec, t):
+        """Linear interpolation between self (t=0) and vec (t=1)"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            v[0] + (vec[0] - v[0]) * t,
+            v[1] + (vec[1] - v[1]) * t,
+            v[2] + (vec[2] - v[2]) * t,
+        )
+
+    def madd(self, vec, s):
+        """Multiply-add: self + vec * s"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            v[0] + vec[0] * s,
+            v[1] + vec[1] * s,
+            v[2] + vec[2] * s,
+        )
+
+    def min_vec(self, vec):
+        """Component-wise minimum"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            vec[0] if vec[0] < v[0] else v[0],
+            vec[1] if vec[1] < v[1] else v[1],
+            vec[2] if vec[2] < v[2] else v[2],
+        )
+
+    def max_vec(self, vec):
+        """Component-wise maximum"""
+        vec = vec._v
+        v = self._v
+        return self._from_floats(
+            vec[0] if vec[0] > v[0] else v[0],
+            vec[1] if vec[1] > v[1] else v[1],
+            vec[2] if vec[2] > v[2] else v[2],
+        )
+
+    def clamp(self, lo, hi):
+        """Clamp each component to the range [lo, hi]"""
+        v = self._v
+        return self._from_floats(
+            lo if v[0] < lo else hi if v[0] > hi else v[0],
+            lo if v[1] < lo else hi if v[1] > hi else v[1],
+            lo if v[2] < lo else hi if v[2] > hi else v[2],
+        )
+
@@ -0,0 +1,311 @@
+"""
+Struct-of-arrays containers for many vectors.
+
+Each component is stored in it's own ``array('d')`` column and the
+element-wise operations run through ``map`` over the columns, which
+avoids one python object per vector. NumPy is not required,
+``to_numpy`` and ``from_numpy`` convert if it is available.
+"""
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import Iterable, Iterator
+
+from .types import *
+from .vec2 import Vec2
+from .vec3 import Vec3
+
+
+class VecArrayBase:
+    """
+    Base class of ``Vec2Array`` and ``Vec3Array``.
+
+    Operands of the arithmetic operators can be
+
+    - a number, applied to all components of all vectors
+    - an ``array('d')`` of one number per vector
+    - another array of the same type, applied element-wise
+    - a single vector (Vec2/Vec3 or tuple), applied to each vector
+    """
+
+    __slots__ = ("columns",)
+
+    # set by derived classes
+    num_components = 0
+    vector_class = None
+
+    def __init__(self, vectors: Iterable = None):
+        self.columns = tuple(array("d") for i in range(self.num_components))
+        if vectors is not None:
+            self.extend(vectors)
+
+    @classmethod
+    def from_columns(cls, *columns: Iterable[float]):
+        """
+        Create from one sequence of floats per component, e.g. ``x, y, z``
+        """
+        if len(columns) != cls.num_components:
+            raise ValueError(f"{cls.__name__} needs {cls.num_components} columns, got {len(columns)}")
+        columns = tuple(c if isinstance(c, array) and c.typecode == "d" else array("d", c) for c in columns)
+        if len(set(len(c) for c in columns)) > 1:
+            raise ValueError(f"columns have different lengths {[len(c) for c in columns]}")
+        arr = cls.__new__(cls)
+        arr.columns = columns
+        return arr
+
+    @classmethod
+    def zeros(cls, num: int):
+        return cls.from_columns(*(array("d", bytes(8 * num)) for i in range(cls.num_components)))
+
+    @classmethod
+    def from_numpy(cls, arr):
+        """
+        Create from a numpy array of shape (N, num_components)
+        """
+        columns = []
+        for i in range(cls.num_components):
+            column = array("d")
+            column.frombytes(arr[:, i].astype("float64").tobytes())
+            columns.append(column)
+        return cls.from_columns(*columns)
+
+    def to_numpy(self):
+        """
+        Returns a numpy array of shape (N, num_components)
+        """
+        import numpy as np
+        return np.column_stack([np.frombuffer(c, dtype=np.float64) for c in self.columns])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)})"
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __iter__(self) -> Iterator:
+        return map(self.vector_class._from_floats, *self.columns)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.from_columns(*(c[i] for c in self.columns))
+        return self.vector_class._from_floats(*(c[i] for c in self.columns))
+
+    def __setitem__(self, i: int, vec):
+        for c, v in zip(self.columns, vec):
+            c[i] = v
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.columns == other.columns
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return False
+
+    def append(self, vec):
+        for c, v in zip(self.columns, vec):
+            c.append(v)
+
+    def extend(self, vectors: Iterable):
+        if isinstance(vectors, self.__class__):
+            for c, o in zip(self.columns, vectors.columns):
+                c.extend(o)
+        else:
+            for vec in vectors:
+                for c, v in zip(self.columns, vec):
+                    c.append(v)
+
+    def copy(self):
+        return self.from_columns(*(array("d", c) for c in self.columns))
+
+    # ---- element-wise arithmetic ----
+
+    def _operand(self, arg):
+        """
+        Returns one iterable per component for the operand ``arg``
+        """
+        if isinstance(arg, (int, float)):
+            return (repeat(arg),) * self.num_components
+        if isinstance(arg, VecArrayBase):
+            return arg.columns
+        if isinstance(arg, array):
+            return (arg,) * self.num_components
+        return tuple(repeat(v) for v in arg)
+
+    def _binary(self, arg, op, reverse: bool = False):
+        operands = self._operand(arg)
+        if reverse:
+            return self.from_columns(*(array("d", map(op, o, c)) for c, o in zip(self.columns, operands)))
+        return self.from_columns(*(array("d", map(op, c, o)) for c, o in zip(self.columns, operands)))
+
+    def _inplace(self, arg, op):
+        self.columns = self._binary(arg, op).columns
+        return self
+
+    def __neg__(self):
+        return self.from_columns(*(array("d", map(operator.neg, c)) for c in self.columns))
+
+    def __add__(self, arg):
+        return self._binary(arg, operator.add)
+
+    def __radd__(self, arg):
+        return self._binary(arg, operator.add, reverse=True)
+
+    def __iadd__(self, arg):
+        return self._inplace(arg, operator.add)
+
+    def __sub__(self, arg):
+        return self._binary(arg, operator.sub)
+
+    def __rsub__(self, arg):
+        return self._binary(arg, operator.sub, reverse=True)
+
+    def __isub__(self, arg):
+        return self._inplace(arg, operator.sub)
+
+    def __mul__(self, arg):
+        return self._binary(arg, operator.mul)
+
+    def __rmul__(self, arg):
+        return self._binary(arg, operator.mul, reverse=True)
+
+    def __imul__(self, arg):
+        return self._inplace(arg, operator.mul)
+
+    def __truediv__(self, arg):
+        return self._binary(arg, operator.truediv)
+
+    def __rtruediv__(self, arg):
+        return self._binary(arg, operator.truediv, reverse=True)
+
+    def __itruediv__(self, arg):
+        return self._inplace(arg, operator.truediv)
+
+    # ---- vector math ----
+
+    def dot(self, arg) -> array:
+        """
+        Returns the dot products with ``arg`` as ``array('d')``
+        """
+        operands = self._operand(arg)
+        products = map(operator.mul, self.columns[0], operands[0])
+        for c, o in zip(self.columns[1:], operands[1:]):
+            products = map(operator.add, products, map(operator.mul, c, o))
+        return array("d", products)
+
+    def length_squared(self) -> array:
+        return self.dot(self)
+
+    def length(self) -> array:
+        """
+        Returns the cartesian lengths as ``array('d')``
+        """
+        return array("d", map(math.sqrt, self.dot(self)))
+
+    def normalize(self):
+        """
+        Normalizes all vectors INPLACE, zero-length vectors are left unchanged
+
+        :return: self
+        """
+        lengths = self.length()
+        self.columns = tuple(
+            array("d", map(_safe_div, c, lengths))
+            for c in self.columns
+        )
+        return self
+
+    def reflect(self, normals):
+        """
+        Reflects all vectors on planes with the given normals INPLACE,
+        like ``Vec3.reflect``
+
+        :param normals: an array of the same type or a single vector
+        :return: self
+        """
+        operands = self._operand(normals)
+        dots = self.dot(normals)
+        self.columns = tuple(
+            array("d", map(_reflect, c, o, dots))
+            for c, o in zip(self.columns, operands)
+        )
+        return self
+
+    def add_scaled(self, arg, scale):
+        """
+        Adds ``arg * scale`` INPLACE, e.g. ``positions.add_scaled(directions, distances)``
+
+        :param arg: an array of the same type or a single vector
+        :param scale: a number or ``array('d')`` with one number per vector
+        :return: self
+        """
+        scales = repeat(scale) if isinstance(scale, (int, float)) else scale
+        operands = self._operand(arg)
+        self.columns = tuple(
+            array("d", map(_madd, c, o, scales))
+            for c, o in zip(self.columns, operands)
+        )
+        return self
+
+
+def _safe_div(v: float, length: float) -> float:
+    return v / length if length else v
+
+
+def _reflect(v: float, n: float, dot: float) -> float:
+    return v - n * dot * 2.
+
+
+def _madd(v: float, o: float, s: float) -> float:
+    return v + o * s
+
+
+class Vec2Array(VecArrayBase):
+    """
+    Many Vec2 stored as two ``array('d')`` columns
+
+    >>> a = Vec2Array([(1, 2), (3, 4)])
+    >>> a * 2 + (1, 0)
+    Vec2Array([Vec2(3.0, 4.0), Vec2(7.0, 8.0)])
+    """
+    __slots__ = ()
+    num_components = 2
+    vector_class = Vec2
+
+    @property
+    def x(self) -> array:
+        return self.columns[0]
+
+    @property
+    def y(self) -> array:
+        return self.columns[1]
+
+
+class Vec3Array(VecArrayBase):
+    """
+    Many Vec3 stored as three ``array('d')`` columns
+
+    >>> a = Vec3Array([(1, 2, 2), (0, 0, 3)])
+    >>> a.length()
+    array('d', [3.0, 3.0])
+    >>> a.normalize()[1]
+    Vec3(0.0, 0.0, 1.0)
+    >>> Vec3Array([(2, -1, 0)]).reflect((0, 1, 0))
+    Vec3Array([Vec3(2.0, 1.0, 0.0)])
+    """
+    __slots__ = ()
+    num_components = 3
+    vector_class = Vec3
+
+    @property
+    def x(self) -> array:
+        return self.columns[0]
+
+    @property
+    def y(self) -> array:
+        return self.columns[1]
+
+    @property
+    def z(self) -> array:
+        return self.columns[2]
@@ -1,5 +1,13 @@
+from .test_bounds import *
+from .test_codegen import *
+from .test_compiler import *
+from .test_image import *
 from .test_primitives import *
+from .test_render import *
 from .test_tracing import *
+from .test_transform import *
 from .test_treenode import *
+from .test_vectorized import *
 from .test_vec2 import *
 from .test_vec3 import *
+from .test_vec_array import *
@@ -0,0 +1,202 @@
+import doctest
+import math
+import random
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.objects import bounds
+from src.objects.bounds import Bounds
+
+
+class CountingSphere(Sphere):
+    num_calls = 0
+
+    def distance(self, pos: Vec3):
+        CountingSphere.num_calls += 1
+        return super().distance(pos)
+
+    def distance_object(self, pos: Vec3, ignore_objects=None):
+        CountingSphere.num_calls += 1
+        return super().distance_object(pos, ignore_objects=ignore_objects)
+
+
+class TestBounds(TestCase):
+
+    def test_doctest(self):
+        result = doctest.testmod(bounds)
+        if result.failed:
+            raise AssertionError(f"{result.failed} failures in doctest")
+
+    def test_primitives(self):
+        self.assertEqual(Bounds((-2, -2, -2), (2, 2, 2)), Sphere(2).bounds())
+        self.assertTrue(Plane((0, 1, 0)).bounds().is_infinite)
+        self.assertTrue(Tube(1).bounds().is_infinite)
+        self.assertEqual(Vec3(-math.inf, -1, -1), Tube(1, axis=0).bounds().min)
+
+    def test_transforms(self):
+        self.assertEqual(
+            Bounds((0, 1, 2), (2, 3, 4)),
+            Sphere().translate((1, 2, 3)).bounds(),
+        )
+        self.assertEqual(
+            Bounds((1, 2, 3), (5, 6, 7)),
+            Sphere().scale(2).translate((3, 4, 5)).bounds(),
+        )
+
+    def test_csg(self):
+        union = Union([Sphere(), Sphere().translate((3, 0, 0))])
+        self.assertEqual(Bounds((-1, -1, -1), (4, 1, 1)), union.bounds())
+        self.assertTrue(Union([Sphere(), Plane((0, 1, 0))]).bounds().is_infinite)
+
+        self.assertEqual(
+            Bounds((-1, -1, -1), (1, 1, 1)),
+            Difference([Sphere(), Sphere(3).translate((2, 0, 0))]).bounds(),
+        )
+        self.assertEqual(
+            Bounds((-.5, -.5, -.5), (.5, .5, .5)),
+            Intersection([Plane((0, 1, 0)), Sphere(.5), Sphere()]).bounds(),
+        )
+
+    def test_bounds_invalidated_by_add_node(self):
+        union = Union([Sphere()])
+        self.assertEqual(Bounds((-1, -1, -1), (1, 1, 1)), union.bounds())
+        union.add_node(Sphere(2))
+        self.assertEqual(Bounds((-2, -2, -2), (2, 2, 2)), union.bounds())
+
+    def test_union_culling(self):
+        # plain Union checks all children, AcceleratedUnion culls them by their boxes
+        def create_spheres():
+            return [
+                CountingSphere(.3).translate((x, y, 0))
+                for x in range(-5, 6)
+                for y in range(-5, 6)
+            ]
+        spheres = create_spheres()
+        union = Union(spheres)
+        accelerated = AcceleratedUnion(create_spheres())
+        rnd = random.Random(42)
+        num_calls = 0
+        for i in range(100):
+            pos = Vec3(rnd.uniform(-7, 7), rnd.uniform(-7, 7), rnd.uniform(-2, 2))
+
+            CountingSphere.num_calls = 0
+            d, o = union.distance_object(pos)
+            self.assertEqual(len(spheres), CountingSphere.num_calls)
+
+            expected_d, expected_o = min(
+                ((s.distance(pos), s.nodes[0]) for s in spheres),
+                key=lambda x: x[0],
+            )
+            self.assertEqual(expected_d, d)
+            self.assertIs(expected_o, o)
+
+            CountingSphere.num_calls = 0
+            d, o = accelerated.distance_object(pos)
+            num_calls += CountingSphere.num_calls
+            self.assertEqual(expected_d, d)
+            self.assertEqual(spheres.index(expected_o.node_parent), accelerated.nodes.index(o.node_parent))
+
+        self.assertLess(num_calls, 100 * len(spheres) // 2)
+
+    def test_lazy_difference(self):
+        # a wall with many small holes
+        holes = [
+            CountingSphere(.3).translate((x, y, 0))
+            for x in range(-5, 6)
+            for y in range(-5, 6)
+        ]
+        wall = Scale(6., Sphere())
+        scene = Difference([wall] + holes)
+        compiled = compile_scene(scene)
+        rnd = random.Random(42)
+        num_calls = 0
+        for i in range(100):
+            pos = Vec3(rnd.uniform(-9, 9), rnd.uniform(-9, 9), rnd.uniform(-2, 2))
+
+            CountingSphere.num_calls = 0
+            d, o = scene.distance_object(pos)
+            num_calls += CountingSphere.num_calls
+
+            expected_d, expected_o = wall.distance(pos), wall.nodes[0]
+            for hole in holes:
+                hole_d = -hole.distance(pos)
+                if hole_d > expected_d:
+                    expected_d, expected_o = hole_d, hole.nodes[0]
+            self.assertEqual(expected_d, d)
+            self.assertIs(expected_o, o)
+            self.assertEqual(expected_d, scene.distance(pos))
+            self.assertEqual((d, o), compiled.distance_object(pos))
+
+        self.assertLess(num_calls, 100 * len(holes) // 4)
+
+    def test_accelerated_union(self):
+        rnd = random.Random(23)
+
+        def create_nodes():
+            rnd.seed(23)
+            return [
+                CountingSphere(rnd.uniform(.1, .5)).translate(
+                    (rnd.uniform(-10, 10), rnd.uniform(-10, 10), rnd.uniform(-10, 10))
+                )
+                for i in range(200)
+            ] + [Plane((0, 1, 0)).translate((0, -12, 0))]
+
+        union = Union(create_nodes())
+        accelerated = AcceleratedUnion(create_nodes())
+        self.assertEqual(union.bounds(), accelerated.bounds())
+
+        num_calls = 0
+        for i in range(200):
+            pos = Vec3(rnd.uniform(-12, 12), rnd.uniform(-12, 12), rnd.uniform(-12, 12))
+            d1, o1 = union.distance_object(pos)
+
+            CountingSphere.num_calls = 0
+            d2, o2 = accelerated.distance_object(pos)
+            num_calls += CountingSphere.num_calls
+
+            self.assertEqual(d1, d2)
+            self.assertEqual(union.nodes.index(o1.node_parent), accelerated.nodes.index(o2.node_parent))
+
+        self.assertLess(num_calls, 200 * 200 // 10)
+
+    def test_culling_with_ignore_objects(self):
+        # the boxes of CSG nodes are no lower bound if their children are ignored
+        def create_hole():
+            return Difference([Sphere(.3), Plane((0, 1, 0))])
+
+        hole = create_hole()
+        union = AcceleratedUnion([Sphere(.5).translate((5, 0, 0)), hole])
+        d, o = union.distance_object(Vec3(5, -1, 0), ignore_objects={hole.nodes[0]})
+        self.assertEqual(-1., d)
+        self.assertIs(hole.nodes[1], o)
+
+        hole = create_hole()
+        difference = Difference([Sphere(6.), hole])
+        d, o = difference.distance_object(Vec3(3, -2, 0), ignore_objects={hole.nodes[0]})
+        self.assertEqual(2., d)
+        self.assertIs(hole.nodes[1], o)
+
+        rnd = random.Random(5)
+        for scene in (union, difference):
+            compiled = compile_scene(scene)
+            ignored = {scene.nodes[1].nodes[0]}
+            for i in range(100):
+                pos = Vec3(rnd.uniform(-7, 7), rnd.uniform(-7, 7), rnd.uniform(-2, 2))
+                self.assertEqual(
+                    scene.distance_object(pos, ignore_objects=ignored),
+                    compiled.distance_object(pos, ignore_objects=ignored),
+                )
+
+    def test_accelerated_union_rebuild_and_refit(self):
+        moving = Sphere().translate((5, 0, 0))
+        union = AcceleratedUnion([Sphere(), moving])
+        self.assertAlmostEqual(1., union.distance(Vec3(3, 0, 0)))
+
+        moving.translation = Vec3(10, 0, 0)
+        moving.invalidate_bounds()
+        self.assertAlmostEqual(2., union.distance(Vec3(3, 0, 0)))
+        self.assertAlmostEqual(1., union.distance(Vec3(12, 0, 0)))
+
+        union.add_node(Sphere().translate((3, 3, 0)))
+        self.assertAlmostEqual(1., union.distance(Vec3(3, 5, 0)))
@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.objects.codegen import generate_scene, render_module
+from . import test_compiler
+
+
+class TestCodegen(TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tempdir.name
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_source(self):
+        scene = Union([Sphere(2.5), Plane((0, 1, 0)).translate((0, -1, 0))])
+        source = render_module(compile_scene(scene))
+        self.assertIn("sqrt(x * x + y * y + z * z) - 2.5", source)
+        self.assertIn("y - -1.0", source)
+        compile(source, "<scene>", "exec")
+
+    def test_distance_and_raymarch(self):
+        scene = test_compiler.TestCompiler.create_scene()
+        generated = generate_scene(scene, cache_dir=self.cache_dir)
+
+        rnd = random.Random(23)
+        for i in range(200):
+            point = Vec3(rnd.uniform(-4, 4), rnd.uniform(-4, 4), rnd.uniform(-4, 4))
+            self.assertEqual(scene.distance_object(point), generated.distance_object(point))
+            self.assertEqual(scene.normal(point), generated.normal(point))
+
+            ignore_objects = {scene.nodes[0]}
+            self.assertEqual(
+                scene.distance_object(point, ignore_objects=ignore_objects),
+                generated.distance_object(point, ignore_objects=ignore_objects),
+            )
+
+        for y in range(-5, 6):
+            for x in range(-6, 7):
+                origin = Vec3(x * .5, y * .5, -5)
+                direction = Vec3(x * .02, y * .02, 1).normalize()
+                self.assertEqual(
+                    scene.raymarch(origin, direction, max_iter=200),
+                    generated.raymarch(origin, direction, max_iter=200),
+                )
+
+    def test_csg_with_dynamic_first_child(self):
+        # the Union's object is only known at run-time, the Plane's is a constant
+        for csg_class in (Difference, Intersection):
+            scene = csg_class([
+                Union([Sphere(1), Sphere(1).translate((1, 0, 0))]),
+                Plane((0, 1, 0)),
+            ])
+            generated = generate_scene(scene, cache_dir=self.cache_dir)
+            for point in (Vec3(3, 1, 0), Vec3(0, -.5, 0), Vec3(.5, .2, .3), Vec3(-2, 2, 1)):
+                self.assertEqual(scene.distance_object(point), generated.distance_object(point))
+
+    def test_disk_cache(self):
+        generated = generate_scene(Sphere(1.25), cache_dir=self.cache_dir)
+        filename = os.path.join(self.cache_dir, f"scene_{generated.hash}.py")
+        self.assertEqual([os.path.basename(filename)], os.listdir(self.cache_dir))
+
+        mtime = os.path.getmtime(filename)
+        generated2 = generate_scene(Sphere(1.25), cache_dir=self.cache_dir)
+        self.assertEqual(generated.hash, generated2.hash)
+        self.assertEqual(mtime, os.path.getmtime(filename))
+
+        generated3 = generate_scene(Sphere(1.5), cache_dir=self.cache_dir)
+        self.assertNotEqual(generated.hash, generated3.hash)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
@@ -0,0 +1,117 @@
+import pickle
+import random
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.raymarcher import Raymarcher
+from src.image import Image
+
+
+class CustomSphere(Sphere):
+    pass
+
+
+class TestCompiler(TestCase):
+
+    @staticmethod
+    def create_scene():
+        return Union([
+            Difference([
+                Sphere(material=Color((1, 0, 0), reflective=.5)),
+                Sphere(.7).translate((0, .5, -.5)),
+                Tube(.3, axis=2),
+            ]),
+            Intersection([
+                Sphere(.8).scale(1.5),
+                Plane((0, -1, 0)),
+            ]).translate((2.5, 0, 0)),
+            AcceleratedUnion([
+                Sphere(.2).translate((x * .5, 1.5, 0))
+                for x in range(-4, 5)
+            ]),
+            CustomSphere(.3).translate((-2.5, 0, 0)),
+            Union(),
+            Plane((0, 1, 0)).translate((0, -2, 0)),
+            Difference([Sphere(.5), Tube(.2, axis=0)]).rotate((0, 1, 1), 30).translate((0, -1, 1)),
+        ])
+
+    def test_distance_object(self):
+        scene = self.create_scene()
+        compiled = compile_scene(scene)
+        rnd = random.Random(23)
+        points = [Vec3(rnd.uniform(-4, 4), rnd.uniform(-4, 4), rnd.uniform(-4, 4)) for _ in range(200)]
+
+        difference = scene.nodes[0]
+        for ignore_objects in (
+                None,
+                {difference},
+                {difference.nodes[0]},
+                {scene.nodes[1]},
+                {scene.nodes[1].nodes[0]},
+                {scene.nodes[3].nodes[0]},
+        ):
+            for point in points:
+                self.assertEqual(
+                    scene.distance_object(point, ignore_objects=ignore_objects),
+                    compiled.distance_object(point, ignore_objects=ignore_objects),
+                )
+
+    def test_raymarch_and_normal(self):
+        scene = self.create_scene()
+        for y in range(-5, 6):
+            for x in range(-6, 7):
+                origin = Vec3(x * .5, y * .5, -5)
+                direction = Vec3(x * .02, y * .02, 1).normalize()
+                pos, obj = scene.raymarch(origin, direction, max_iter=200)
+                self.assertEqual((pos, obj), scene.raymarch(origin, direction, max_iter=200, compiled=True))
+                self.assertEqual(
+                    scene.raymarch(origin, direction, max_iter=200, omega=1.5),
+                    scene.raymarch(origin, direction, max_iter=200, omega=1.5, compiled=True),
+                )
+                self.assertEqual(scene.normal(pos), scene.normal(pos, compiled=True))
+
+    def test_render(self):
+        def ray_function(pos: Vec2):
+            return Vec3(0, 0, -5), Vec3(pos.x, pos.y, 2).normalize()
+
+        images = []
+        for scene in (self.create_scene(), compile_scene(self.create_scene())):
+            image = Image(12, 8)
+            Raymarcher(scene).render(image, ray_function, verbose=False)
+            images.append(image)
+
+        self.assertEqual(images[0].data, images[1].data)
+
+    def test_node_ids(self):
+        scene = self.create_scene()
+        table = scene.node_table()
+        nodes = list(scene.iter_pre_order())
+        self.assertEqual(len(nodes), len(table))
+        self.assertEqual(len(nodes), len({n.node_name for n in nodes}))
+        for i, node in enumerate(nodes):
+            self.assertEqual(i, node.node_id)
+            self.assertIs(node, table[i])
+            self.assertIs(getattr(node, "material", None), table.material(i))
+        self.assertIsNone(table[-1])
+
+        red = scene.nodes[0].nodes[0]
+        self.assertEqual((1, 0, 0), tuple(table.material(red.node_id).color))
+
+        # the compiled program uses the same IDs
+        compiled = compile_scene(scene)
+        rnd = random.Random(23)
+        for i in range(50):
+            point = Vec3(rnd.uniform(-4, 4), rnd.uniform(-4, 4), rnd.uniform(-4, 4))
+            d, o = compiled._run(*point)
+            self.assertIs(scene.distance_object(point)[1], table[o])
+
+        # IDs are stable in copies of the scene
+        copy = pickle.loads(pickle.dumps(scene))
+        self.assertEqual(
+            [n.node_name for n in table.objects],
+            [n.node_name for n in copy.node_table().objects],
+        )
+
+        scene.add_node(Sphere())
+        self.assertEqual(len(nodes), scene.node_table()[len(nodes)].node_id)
@@ -0,0 +1,115 @@
+import struct
+import sys
+import zlib
+from array import array
+from io import StringIO, BytesIO
+from unittest import TestCase
+
+from src.vec import *
+from src.image import Image
+
+
+class TestImage(TestCase):
+
+    def test_views(self):
+        image = Image(3, 2)
+        self.assertEqual(3 * 2 * 3, len(image.pixels))
+        self.assertEqual(2, len(image.data))
+        self.assertEqual(3, len(image.data[0]))
+
+        image.data[1][2] += Vec3(1, 2, 3)
+        image.data[1][2] += Vec3(1, 1, 1)
+        image.add_pixel(0, 1, (.5, .5, .5))
+        self.assertEqual(Vec3(2, 3, 4), image.data[1][2])
+        self.assertEqual(Vec3(2, 3, 4), image.pixel(2, 1))
+        self.assertEqual(Vec3(.5, .5, .5), image.data[-1][0])
+        self.assertEqual([2., 3., 4.], list(image.pixels[-3:]))
+        self.assertEqual([Vec3(.5, .5, .5), Vec3(), Vec3(2, 3, 4)], list(image.data[1]))
+
+        with self.assertRaises(IndexError):
+            image.data[2]
+        with self.assertRaises(IndexError):
+            image.data[0][3]
+
+    def test_bulk(self):
+        image = Image(2, 2)
+        image.set_pixel(1, 0, (1, 2, 3))
+        image.scale(.5)
+        self.assertEqual(Vec3(.5, 1, 1.5), image.pixel(1, 0))
+        image.map(lambda c: c + 1)
+        self.assertEqual(Vec3(1.5, 2, 2.5), image.pixel(1, 0))
+        self.assertEqual(Vec3(1, 1, 1), image.pixel(0, 1))
+
+        tile = Image(1, 2)
+        tile.set_pixel(0, 1, (1, 1, 1))
+        image.add_tile(1, 0, tile)
+        self.assertEqual(Vec3(1.5, 2, 2.5), image.pixel(1, 0))
+        self.assertEqual(Vec3(2, 2, 2), image.pixel(1, 1))
+        self.assertEqual(Vec3(1, 1, 1), image.pixel(0, 1))
+
+    def test_dump_bw(self):
+        image = Image(3, 1)
+        image.set_pixel(1, 0, (0, .5, 0))
+        file = StringIO()
+        image.dump_bw(file=file, black=".", white="#")
+        self.assertEqual("..##..\n", file.getvalue())
+
+    def create_image(self):
+        image = Image(3, 2)
+        image.set_pixel(0, 0, (1, .5, 0))
+        image.set_pixel(2, 1, (2, -1, .25))
+        return image
+
+    def test_write_bitmap(self):
+        file = StringIO()
+        self.create_image().write_bitmap(file)
+        self.assertEqual("P1\n3 2\n0 1 1\n1 1 0\n", file.getvalue())
+
+    def test_write_pixmap(self):
+        file = StringIO()
+        self.create_image().write_pixmap(file)
+        self.assertEqual("P3\n3 2\n255\n255 127 0 0 0 0 0 0 0\n0 0 0 0 0 0 255 0 63\n", file.getvalue())
+
+    def test_write_ppm(self):
+        file = BytesIO()
+        self.create_image().write_ppm(file)
+        self.assertEqual(
+            b"P6\n3 2\n255\n" + bytes([255, 127, 0] + [0] * 12 + [255, 0, 63]),
+            file.getvalue(),
+        )
+
+    def test_write_pfm(self):
+        file = BytesIO()
+        self.create_image().write_pfm(file)
+        header, size, scale, data = file.getvalue().split(b"\n", 3)
+        self.assertEqual((b"PF", b"3 2"), (header, size))
+
+        values = array("f")
+        values.frombytes(data)
+        if (float(scale) < 0) != (sys.byteorder == "little"):
+            values.byteswap()
+        # bottom row first
+        self.assertEqual([0.] * 6 + [2., -1., .25, 1., .5, 0.] + [0.] * 6, list(values))
+
+    def test_write_png(self):
+        file = BytesIO()
+        self.create_image().write_png(file)
+        data = file.getvalue()
+        self.assertEqual(b"\x89PNG\r\n\x1a\n", data[:8])
+
+        chunks = {}
+        pos = 8
+        while pos < len(data):
+            length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+            chunk = data[pos + 8:pos + 8 + length]
+            crc, = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+            self.assertEqual(zlib.crc32(tag + chunk), crc)
+            chunks[tag] = chunk
+            pos += 12 + length
+
+        self.assertEqual((3, 2, 8, 2, 0, 0, 0), struct.unpack(">IIBBBBB", chunks[b"IHDR"]))
+        self.assertEqual(
+            bytes([0, 255, 127, 0] + [0] * 6 + [0] * 7 + [255, 0, 63]),
+            zlib.decompress(chunks[b"IDAT"]),
+        )
+        self.assertEqual(b"", chunks[b"IEND"])
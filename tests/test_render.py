@@ -0,0 +1,107 @@
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+from io import BytesIO
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.raymarcher import Raymarcher
+from src.image import Image, SharedImage, PPMSink, PNGSink
+
+
+class TestRender(TestCase):
+
+    @staticmethod
+    def create_scene():
+        return Union([
+            Sphere(material=Color((1, .5, .2), reflective=.5)),
+            Sphere(.5, material=Color((.2, .5, 1))).translate((1.2, .3, -.5)),
+            Translate(
+                Plane((0, 1, 0), material=Checker(Color((1, 1, 1)), Color((0, 0, 0)))),
+                (0, -1, 0),
+            ),
+        ])
+
+    @staticmethod
+    def ray_function(pos: Vec2):
+        return Vec3(0, 0, -4), Vec3(pos.x, pos.y, 2).normalize()
+
+    def render(self, width: int, height: int, **kwargs):
+        raymarcher = Raymarcher(self.create_scene())
+        image = Image(width, height)
+        raymarcher.render(image, self.ray_function, verbose=False, **kwargs)
+        return image, raymarcher.statistics
+
+    def test_workers_match_single_process(self):
+        for aa in (0, 2):
+            image1, stats1 = self.render(11, 7, aa=aa)
+            image2, stats2 = self.render(11, 7, aa=aa, workers=3, tile_size=4)
+
+            self.assertEqual(image1.data, image2.data)
+            self.assertEqual(stats1.num_pixel_casts, stats2.num_pixel_casts)
+            self.assertEqual(stats1.num_rays, stats2.num_rays)
+            self.assertEqual(stats1.num_reflections, stats2.num_reflections)
+
+    def test_streaming_sinks(self):
+        image, _ = self.render(11, 7, aa=2)
+        expected_ppm = BytesIO()
+        image.write_ppm(expected_ppm)
+        expected_rows = b"".join(b"\x00" + image.row_bytes(y) for y in range(image.height))
+
+        with tempfile.TemporaryDirectory() as path:
+            for workers in (1, 3):
+                filename = os.path.join(path, "image.ppm")
+                with PPMSink(filename, 11, 7) as sink:
+                    Raymarcher(self.create_scene()).render(
+                        sink, self.ray_function, aa=2, verbose=False, workers=workers, tile_size=3,
+                    )
+                with open(filename, "rb") as fp:
+                    self.assertEqual(expected_ppm.getvalue(), fp.read())
+
+                filename = os.path.join(path, "image.png")
+                with PNGSink(filename, 11, 7) as sink:
+                    Raymarcher(self.create_scene()).render(
+                        sink, self.ray_function, aa=2, verbose=False, workers=workers, tile_size=3,
+                    )
+                with open(filename, "rb") as fp:
+                    data = fp.read()
+                # 3 bands, each in one IDAT chunk, plus the final one
+                self.assertEqual(4, data.count(b"IDAT"))
+                idat = b""
+                pos = 8
+                while pos < len(data):
+                    length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+                    if tag == b"IDAT":
+                        idat += data[pos + 8:pos + 8 + length]
+                    pos += 12 + length
+                self.assertEqual(expected_rows, zlib.decompress(idat))
+
+    def test_png_sink_rows_in_order(self):
+        with tempfile.TemporaryDirectory() as path:
+            with PNGSink(os.path.join(path, "image.png"), 2, 2) as sink:
+                with self.assertRaises(ValueError):
+                    sink.write_rows(1, Image(2, 1))
+
+    def test_shared_image(self):
+        image, _ = self.render(11, 7, aa=2)
+
+        for workers in (1, 3):
+            with SharedImage(11, 7) as shared:
+                Raymarcher(self.create_scene()).render(
+                    shared, self.ray_function, aa=2, verbose=False, workers=workers, tile_size=4,
+                )
+                self.assertEqual(list(image.pixels), list(shared.pixels))
+
+                expected, result = BytesIO(), BytesIO()
+                image.write_ppm(expected)
+                shared.write_ppm(result)
+                self.assertEqual(expected.getvalue(), result.getvalue())
+
+                # attach to the same memory
+                attached = pickle.loads(pickle.dumps(shared))
+                attached.set_pixel(0, 0, (1, 2, 3))
+                self.assertEqual(Vec3(1, 2, 3), shared.pixel(0, 0))
+                attached.close()
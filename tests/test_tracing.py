@@ -43,3 +43,174 @@ class TestTracing(TestCase):
 
         refl = dir.reflected(norm)
         self.assertEqual(Vec3(0, 1, 0), refl.rounded(3))
+
+    def test_raymarch_many(self):
+        scene = Union([
+            Sphere(),
+            Sphere(.5).translate((2, 0, 0)),
+        ])
+        origins = [Vec3(-3, y * .25, 0.) for y in range(-6, 7)]
+        directions = [Vec3(1, 0, 0), Vec3(1, .1, 0).normalize()] * 6 + [Vec3(0, 1, 0)]
+
+        positions, objects, iterations = scene.raymarch_many(origins, directions, max_iter=100)
+        self.assertEqual(len(origins), len(positions))
+
+        for i, (origin, direction) in enumerate(zip(origins, directions)):
+            pos, obj = scene.raymarch(origin, direction, max_iter=100)
+            self.assertEqual(pos, positions[i])
+            self.assertIs(obj, objects[i])
+            if obj is None:
+                self.assertEqual(100, iterations[i])
+            else:
+                self.assertLess(iterations[i], 100)
+
+    def test_raymarch_over_relaxed(self):
+        scene = Union([
+            Sphere(),
+            Sphere(.5).translate((1.5, .3, -.5)),
+            Plane((0, 1, 0)).translate((0, -1, 0)),
+        ])
+        origins, directions = [], []
+        for y in range(-10, 11):
+            for x in range(-10, 11):
+                origins.append(Vec3(0, 0, -5))
+                directions.append(Vec3(x * .05, y * .05 - .3, 1).normalize())
+
+        positions1, objects1, iterations1 = scene.raymarch_many(origins, directions)
+        positions2, objects2, iterations2 = scene.raymarch_many(origins, directions, omega=1.4)
+
+        hits = [i for i, obj in enumerate(objects1) if obj is not None]
+        self.assertTrue(hits)
+        for i in hits:
+            self.assertIs(objects1[i], objects2[i])
+            self.assertLess(positions1[i].distance(positions2[i]), 0.001)
+
+            pos, obj = scene.raymarch(origins[i], directions[i], omega=1.4)
+            self.assertEqual((positions2[i], objects2[i]), (pos, obj))
+
+        self.assertLess(
+            sum(iterations2[i] for i in hits),
+            sum(iterations1[i] for i in hits) * .9,
+        )
+
+    def test_raymarch_max_distance(self):
+        scene = Sphere().translate((0, 0, 10))
+
+        for compiled in (False, True):
+            positions, objects, iterations = scene.raymarch_many(
+                [Vec3(0, 2, 0)], [Vec3(0, 1, 0)], max_distance=100.,
+            ) if not compiled else scene.compiled().raymarch_many(
+                [Vec3(0, 2, 0)], [Vec3(0, 1, 0)], max_distance=100.,
+            )
+            self.assertIsNone(objects[0])
+            self.assertLess(iterations[0], 10)
+
+        pos, obj = scene.raymarch(Vec3(0, 0, 0), Vec3(0, 0, 1), max_distance=100.)
+        self.assertEqual(scene.nodes[0], obj)
+
+    def test_raymarch_cone_epsilon(self):
+        scene = Sphere().translate((0, 0, 100))
+        direction = Vec3(0, .0099, 1).normalize()
+
+        _, _, iterations1 = scene.raymarch_many([Vec3(0, 0, 0)], [direction])
+        positions2, objects2, iterations2 = scene.raymarch_many(
+            [Vec3(0, 0, 0)], [direction], cone_angle=0.001,
+        )
+        self.assertIs(scene.nodes[0], objects2[0])
+        self.assertLess(iterations2[0], iterations1[0])
+        self.assertLess(scene.distance(positions2[0]), 0.1)
+
+        pos, obj = scene.compiled().raymarch(Vec3(0, 0, 0), direction, cone_angle=0.001)
+        self.assertEqual((positions2[0], objects2[0]), (pos, obj))
+
+    def test_analytic_normal(self):
+        class CustomSphere(Sphere):
+            # no analytic gradient, uses the numerical estimate
+            def distance_gradient(self, pos, e=0.0001):
+                return Base.distance_gradient(self, pos, e)
+
+        scene = Union([
+            Difference([
+                Sphere(2),
+                Tube(.5, axis=1),
+                Scale(.5, CustomSphere().translate((0, 0, -3))),
+            ]),
+            Intersection([
+                Sphere(),
+                Plane(Vec3(1, 1, 0).normalize()),
+            ]).translate((4, 0, 0)),
+            Plane((0, 1, 0)).translate((0, -3, 0)),
+        ])
+        rnd = random.Random(23)
+        for i in range(200):
+            pos = Vec3(rnd.uniform(-3, 6), rnd.uniform(-3, 3), rnd.uniform(-3, 3))
+            d1 = scene.distance(pos)
+            d2, grad = scene.distance_gradient(pos)
+            self.assertEqual(d1, d2)
+            self.assertLess(
+                scene.normal(pos, e=1e-6).distance(scene.normal(pos, analytic=True)),
+                0.001,
+            )
+
+    def test_ignore_mask(self):
+        scene = Union([
+            Sphere(),
+            Sphere(.5).translate((2, 0, 0)),
+            Plane((1, 0, 0)).translate((4, 0, 0)),
+        ])
+        table = scene.node_table()
+        sphere, translate = scene.nodes[0], scene.nodes[1]
+        origin, direction = Vec3(-3, 0, 0), Vec3(1, 0, 0)
+
+        for ignore in ({sphere}, {sphere, translate}):
+            mask = table.mask(ignore)
+            self.assertEqual(ignore, table.nodes_of_mask(mask))
+            expected = scene.raymarch(origin, direction, ignore_objects=ignore)
+            self.assertEqual(expected, scene.raymarch(origin, direction, ignore_objects=mask))
+            self.assertEqual(expected, scene.raymarch(origin, direction, ignore_objects=mask, compiled=True))
+            self.assertEqual(
+                ([expected[0]], [expected[1]]),
+                scene.raymarch_many([origin], [direction], ignore_objects=mask)[:2],
+            )
+
+        # nodes of other scenes have no ID and are not added to the table
+        with self.assertRaises(ValueError):
+            table.mask({sphere, Sphere()})
+        self.assertEqual(len(table.materials), len(table))
+        self.assertEqual(
+            scene.raymarch(origin, direction, ignore_objects={sphere}),
+            scene.raymarch(origin, direction, ignore_objects={sphere, Sphere()}, compiled=True),
+        )
+
+    def test_ignore_mask_subtree(self):
+        a = Sphere()
+        b = Sphere(.5)
+        sub = Union([a, b.translate((2, 0, 0))])
+        root = Union([Plane((0, 1, 0)).translate((0, -3, 0)), Sphere().translate((0, 5, 0)), sub])
+        origin, direction = Vec3(-3, 0, 0), Vec3(1, 0, 0)
+
+        # masks are numbered by node_id, also when marching a subtree
+        mask = 1 << a.node_id
+        self.assertEqual(mask, root.node_table().mask({a}))
+        self.assertNotEqual(mask, sub.node_table().mask({a}))
+        expected = sub.raymarch(origin, direction, ignore_objects={a})
+        self.assertIs(b, expected[1])
+        self.assertEqual(expected, sub.raymarch(origin, direction, ignore_objects=mask))
+        self.assertEqual(expected, sub.raymarch(origin, direction, ignore_objects=mask, compiled=True))
+        self.assertEqual(expected, root.raymarch(origin, direction, ignore_objects=mask, compiled=True))
+        self.assertEqual((expected[0], b), sub.compiled().raymarch(origin, direction, ignore_objects=mask))
+        self.assertEqual(
+            ([expected[0]], [b]),
+            sub.raymarch_many([origin], [direction], ignore_objects=mask)[:2],
+        )
+
+    def test_reflect_concave(self):
+        # the inside of a hollow sphere reflects itself
+        mirror = Color((1, 0, 0), reflective=.5)
+        bowl = Difference([Sphere(2, material=Color((0, 0, 1))), Sphere(1.9, material=mirror)])
+        raymarcher = Raymarcher(bowl)
+        raymarcher.max_reflections = 1
+
+        color = raymarcher._get_ray_color(Vec3(0, 0, 0), Vec3(0, 0, -1), raymarcher.max_reflections)
+        # red plus the reflected red, weighted 1 and .5
+        self.assertEqual(Vec3(1.333, 0, 0), color.rounded(3))
@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.objects.param_space import ParameterizedSpaceNode
+from src.objects.bounds import Bounds
+from src.objects.transform import TransformBase
+
+
+class ChainOnlyTransform(TransformBase):
+    """
+    A transform without ``local_transform``, uses the parent-chain walk
+    """
+    def distance_object(self, pos, ignore_objects=None):
+        return self.nodes[0].distance(self.to_local_position(pos)), self.nodes[0]
+
+    def to_local_position(self, outside_pos):
+        return Vec3(outside_pos.z, outside_pos.x, outside_pos.y)
+
+    def from_local_position(self, local_pos):
+        return Vec3(local_pos.y, local_pos.z, local_pos.x)
+
+
+def chain_to_local(node, pos):
+    nodes = []
+    while node:
+        nodes.append(node)
+        node = node.node_parent
+    for node in reversed(nodes):
+        pos = node.to_local_position(pos)
+    return pos
+
+
+class TestTransform(TestCase):
+
+    def test_global_transform(self):
+        sphere = Sphere()
+        Union([Sphere(), sphere.translate((1, 2, 3)).scale(2).translate((-1, 0, 1))])
+
+        self.assertEqual((Vec3(1, 4, 7), 2.), sphere.global_transform())
+        for pos in (Vec3(0, 0, 0), Vec3(1, 4, 7), Vec3(-3.5, 2.25, 10)):
+            self.assertEqual(chain_to_local(sphere, pos), sphere.global_to_local_position(pos))
+            self.assertEqual(pos, sphere.local_to_global_position(sphere.global_to_local_position(pos)))
+
+    def test_global_transform_invalidated(self):
+        sphere = Sphere()
+        translate = sphere.translate((1, 0, 0))
+        scale = translate.scale(2)
+        self.assertEqual(Vec3(-.5, 0, 0), sphere.global_to_local_position(Vec3(1, 0, 0)))
+
+        scale.scale = 4.
+        self.assertEqual(Vec3(-.75, 0, 0), sphere.global_to_local_position(Vec3(1, 0, 0)))
+
+        translate.translation = Vec3(0, 1, 0)
+        self.assertEqual(Vec3(.25, -1, 0), sphere.global_to_local_position(Vec3(1, 0, 0)))
+
+        # in-place changes need an explicit invalidation
+        translate.translation.y = 2
+        translate.invalidate_bounds()
+        self.assertEqual(Vec3(.25, -2, 0), sphere.global_to_local_position(Vec3(1, 0, 0)))
+
+        Translate(scale, (4, 0, 0))
+        self.assertEqual(Vec3(-.75, -2, 0), sphere.global_to_local_position(Vec3(1, 0, 0)))
+
+    def test_global_transform_cached(self):
+        sphere = Sphere()
+        translate = sphere.translate((1, 0, 0))
+        transform = sphere.global_transform()
+        self.assertIs(transform[0], sphere.global_transform()[0])
+        translate.translation = Vec3(2, 0, 0)
+        self.assertIsNot(transform[0], sphere.global_transform()[0])
+
+    def test_chain_fallback(self):
+        sphere = Sphere()
+        ChainOnlyTransform(sphere.translate((1, 2, 3))).translate((0, 1, 0))
+        self.assertIsNone(sphere.global_transform())
+
+        pos = Vec3(4, 5, 6)
+        self.assertEqual(chain_to_local(sphere, pos), sphere.global_to_local_position(pos))
+        self.assertEqual(pos, sphere.local_to_global_position(sphere.global_to_local_position(pos)))
+
+    def test_identity(self):
+        node = ParameterizedSpaceNode()
+        self.assertEqual((Vec3(), 1.), node.global_transform())
+
+    def test_affine(self):
+        rotated = Tube(.5, axis=0).rotate((0, 0, 1), 90)
+        self.assertAlmostEqual(1., rotated.distance(Vec3(0, 100, 1.5)))
+        self.assertAlmostEqual(0., rotated.distance(Vec3(.5, 100, 0)))
+
+        affine = Affine(Sphere(), matrix=(0, -2, 0, 2, 0, 0, 0, 0, 2), translation=(1, 2, 3))
+        self.assertEqual(2., affine.lipschitz)
+        self.assertAlmostEqual(1., affine.distance(Vec3(1, 2, 6)))
+        self.assertEqual(Bounds((-1, 0, 1), (3, 4, 5)), affine.bounds())
+        for pos in (Vec3(1, 2, 3), Vec3(-2, 5, .5)):
+            self.assertEqual(pos, affine.from_local_position(affine.to_local_position(pos)))
+
+        d, grad = affine.distance_gradient(Vec3(1, 5, 3))
+        self.assertAlmostEqual(1., d)
+        self.assertEqual(Vec3(0, 1, 0), grad.rounded(6))
+
+        with self.assertRaises(ValueError):
+            Affine(Sphere(), matrix=(1, 0, 0, 0, 2, 0, 0, 0, 1))
+
+    def test_fold_transforms(self):
+        sphere = Sphere(.5, material=Color((1, 0, 0)))
+        chain = sphere.scale(2).rotate((1, 1, 0), 45).translate((1, 0, 0)).scale(.5).translate((0, 1, 2))
+        plane = Plane((0, 1, 0)).translate((0, -1, 0))
+        scene = Union([chain, plane, Sphere().translate((3, 0, 0))])
+        points = [Vec3(x * .7, y * .6, z * .5) for x in range(-4, 5) for y in range(-3, 4) for z in range(-3, 4)]
+        expected = [scene.distance(p) for p in points]
+        expected_local = sphere.global_to_local_position(Vec3(1, 2, 3))
+
+        self.assertIs(scene, fold_transforms(scene))
+        folded = scene.nodes[0]
+        self.assertIsInstance(folded, Affine)
+        self.assertIs(sphere, folded.nodes[0])
+        # single transforms are left alone
+        self.assertIs(plane, scene.nodes[1])
+        self.assertIsInstance(scene.nodes[2], Translate)
+
+        for p, d in zip(points, expected):
+            self.assertAlmostEqual(d, scene.distance(p))
+        self.assertEqual(expected_local.rounded(9), sphere.global_to_local_position(Vec3(1, 2, 3)).rounded(9))
+
+        root = fold_transforms(Sphere().translate((1, 0, 0)).scale(3))
+        self.assertIsInstance(root, Affine)
+        self.assertIsNone(root.node_parent)
+        self.assertEqual((3., 0., 0.), root.affine()[1])
@@ -124,6 +124,56 @@ class TestTreeNode(TestCase):
         self.assertEqual(a.render_node_tree(), a_str)
         self.assertEqual(b.render_node_tree(), b_str)
 
+    def test_remove_and_replace_node(self):
+        a = self.create_tree_1()
+        b, e = a.nodes
+        a.remove_node(b)
+        self.assertEqual([e], a.nodes)
+        self.assertIsNone(b.node_parent)
+        with self.assertRaises(ValueError):
+            a.remove_node(b)
+
+        x = TreeNode("X")
+        e.replace_node(e.nodes[0], x)
+        self.assertEqual("X, H", ", ".join(n.node_name for n in e.nodes))
+        self.assertIs(e, x.node_parent)
+        with self.assertRaises(ValueError):
+            e.replace_node(x, e.nodes[1])
+        self.assertEqual("X, H", ", ".join(n.node_name for n in e.nodes))
+
+    def test_node_index(self):
+        a = self.create_tree_1()
+        b, e = a.nodes
+        j = e.nodes[1].nodes[0].nodes[0]
+        self.assertEqual("J", j.node_name)
+        self.assertEqual(10, len(a.nodes_as_set()))
+        self.assertEqual({"E", "F", "G", "H", "I", "J"}, {n.node_name for n in e.nodes_as_set()})
+        self.assertTrue(a.contains_node(j))
+        self.assertTrue(e.contains_node(j))
+        self.assertFalse(b.contains_node(j))
+        self.assertFalse(j.contains_node(j))
+
+        with self.assertRaises(ValueError):
+            b.add_node(j)
+        with self.assertRaises(ValueError):
+            j.add_node(a)
+        # a node can only have one parent
+        with self.assertRaises(ValueError):
+            TreeNode("X").add_node(b)
+
+        a.remove_node(e)
+        self.assertFalse(a.contains_node(j))
+        self.assertTrue(e.contains_node(j))
+        self.assertEqual(4, len(a.nodes_as_set()))
+        self.assertEqual(6, len(e.nodes_as_set()))
+
+        # attach the larger tree to the smaller
+        b.nodes[0].add_node(e)
+        self.assertTrue(a.contains_node(j))
+        self.assertTrue(b.contains_node(j))
+        self.assertEqual(10, len(a.nodes_as_set()))
+        self.assertIs(a.node_root, j.node_root)
+
     def test_traversal_depth_first(self):
         v = self.NameVisitor()
         v.traverse_depth_first(self.create_tree_1())
@@ -159,3 +209,36 @@ class TestTreeNode(TestCase):
         v = self.NameVisitor()
         v.traverse_reverse(self.create_tree_2())
         self.assertEqual("J, M, I, G, L, K, H, F, D, C, E, B, A, ", v.s)
+
+    def test_iterators(self):
+        def names(nodes):
+            return ", ".join(n.node_name for n in nodes)
+
+        a = self.create_tree_2()
+        self.assertEqual("A, B, C, D, K, L, M, E, F, G, H, I, J", names(a.iter_pre_order()))
+        self.assertEqual("C, K, M, L, D, B, G, F, J, I, H, E, A", names(a.iter_post_order()))
+        self.assertEqual("A, B, E, C, D, F, H, K, L, G, I, M, J", names(a.iter_level_order()))
+
+        def prune(node):
+            return node.node_name in ("D", "H")
+
+        self.assertEqual("A, B, C, D, E, F, G, H", names(a.iter_pre_order(prune)))
+        self.assertEqual("C, D, B, G, F, H, E, A", names(a.iter_post_order(prune)))
+        self.assertEqual("A, B, E, C, D, F, H, G", names(a.iter_level_order(prune)))
+
+        v = self.NameVisitor()
+        v.traverse_breath_first(a, prune)
+        self.assertEqual("A, B, E, C, D, F, H, G, ", v.s)
+
+    def test_deep_tree(self):
+        root = node = TreeNode("0")
+        for i in range(1, 5000):
+            child = TreeNode(str(i))
+            node.add_node(child)
+            node = child
+
+        self.assertEqual(5000, len(list(root.iter_post_order())))
+        self.assertEqual(5000, len(root.nodes_as_level_dict()))
+        v = self.NameVisitor()
+        v.traverse_depth_first(root)
+        self.assertTrue(v.s.startswith("4999, 4998, "))
@@ -48,3 +48,32 @@ class TestVec3(TestCase):
         v = Vec3()
         v += 1
         self.assertEqual((1, 1, 1), v)
+
+    def test_typed_op(self):
+        rnd = random.Random(42)
+        for i in range(20):
+            a = Vec3(rnd.uniform(-2, 2), rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+            b = Vec3(rnd.uniform(.1, 2), rnd.uniform(.1, 2), rnd.uniform(.1, 2))
+            s = rnd.uniform(.1, 2)
+            for name, op in (("add", "__add__"), ("sub", "__sub__"), ("mul", "__mul__"),
+                             ("div", "__truediv__"), ("mod", "__mod__")):
+                self.assertEqual(getattr(a, op)(b), getattr(a, f"{name}_vec")(b))
+                self.assertEqual(getattr(a, op)(s), getattr(a, f"{name}_scalar")(s))
+
+                v = a.copy()
+                self.assertIs(v, getattr(v, f"i{name}_vec")(b))
+                self.assertEqual(getattr(a, op)(b), v)
+                v = a.copy()
+                self.assertIs(v, getattr(v, f"i{name}_scalar")(s))
+                self.assertEqual(getattr(a, op)(s), v)
+
+    def test_hot_op(self):
+        a, b = Vec3(1, 2, 3), Vec3(3, 0, 5)
+        self.assertEqual(Vec3(2, 1, 4), a.lerp(b, .5))
+        self.assertEqual(a, a.lerp(b, 0))
+        self.assertEqual(b, a.lerp(b, 1))
+        self.assertEqual(a + b * 2, a.madd(b, 2))
+        self.assertEqual(a.copy().add_scaled(b, 2), a.madd(b, 2))
+        self.assertEqual(Vec3(1, 0, 3), a.min_vec(b))
+        self.assertEqual(Vec3(3, 2, 5), a.max_vec(b))
+        self.assertEqual(Vec3(1.5, 2, 2.5), a.clamp(1.5, 2.5))
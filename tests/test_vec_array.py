@@ -0,0 +1,97 @@
+import random
+from array import array
+from unittest import TestCase
+import doctest
+
+from src.vec import Vec2, Vec3, Vec2Array, Vec3Array, vec_array
+from src.objects.vectorized import HAS_NUMPY
+
+
+class TestVecArray(TestCase):
+
+    def test_doctest(self):
+        result = doctest.testmod(vec_array)
+        if result.failed:
+            raise AssertionError(f"{result.failed} failures in doctest")
+
+    def create_vectors(self, num: int = 10, seed: int = 23):
+        rnd = random.Random(seed)
+        return [Vec3(rnd.uniform(-2, 2), rnd.uniform(-2, 2), rnd.uniform(-2, 2)) for i in range(num)]
+
+    def test_container(self):
+        vectors = self.create_vectors()
+        a = Vec3Array(vectors)
+        self.assertEqual(10, len(a))
+        self.assertEqual(vectors, list(a))
+        self.assertEqual(vectors[3], a[3])
+        self.assertEqual(vectors[2:5], list(a[2:5]))
+        self.assertEqual(a, vectors)
+        self.assertEqual(a, a.copy())
+
+        a[3] = (1, 2, 3)
+        self.assertEqual(Vec3(1, 2, 3), a[3])
+        self.assertEqual(1., a.x[3])
+        a.append(Vec3(4, 5, 6))
+        self.assertEqual(Vec3(4, 5, 6), a[-1])
+        a.extend(Vec3Array.zeros(2))
+        self.assertEqual(13, len(a))
+        self.assertEqual(Vec3(), a[12])
+
+        with self.assertRaises(ValueError):
+            Vec3Array.from_columns([1], [2])
+        with self.assertRaises(ValueError):
+            Vec3Array.from_columns([1], [2], [3, 4])
+
+    def test_arithmetic(self):
+        vectors1, vectors2 = self.create_vectors(seed=1), self.create_vectors(seed=2)
+        a, b = Vec3Array(vectors1), Vec3Array(vectors2)
+        scales = array("d", [i + .5 for i in range(len(a))])
+
+        self.assertEqual([v1 + v2 for v1, v2 in zip(vectors1, vectors2)], list(a + b))
+        self.assertEqual([v1 - v2 for v1, v2 in zip(vectors1, vectors2)], list(a - b))
+        self.assertEqual([v1 * v2 for v1, v2 in zip(vectors1, vectors2)], list(a * b))
+        self.assertEqual([v1 / v2 for v1, v2 in zip(vectors1, vectors2)], list(a / b))
+        self.assertEqual([v * 2 for v in vectors1], list(a * 2))
+        self.assertEqual([2 - v for v in vectors1], list(2 - a))
+        self.assertEqual([v + (1, 2, 3) for v in vectors1], list(a + (1, 2, 3)))
+        self.assertEqual([v * s for v, s in zip(vectors1, scales)], list(a * scales))
+        self.assertEqual([-v for v in vectors1], list(-a))
+
+        c = a.copy()
+        c += b
+        c *= 2
+        self.assertEqual([(v1 + v2) * 2 for v1, v2 in zip(vectors1, vectors2)], list(c))
+        self.assertEqual(vectors1, list(a))
+
+        c = a.copy().add_scaled(b, scales)
+        self.assertEqual([v1.madd(v2, s) for v1, v2, s in zip(vectors1, vectors2, scales)], list(c))
+
+    def test_vector_math(self):
+        vectors1, vectors2 = self.create_vectors(seed=1), self.create_vectors(seed=2)
+        a, b = Vec3Array(vectors1), Vec3Array(vectors2)
+
+        self.assertEqual([v1.dot(v2) for v1, v2 in zip(vectors1, vectors2)], list(a.dot(b)))
+        self.assertEqual([v.length() for v in vectors1], list(a.length()))
+        self.assertEqual(
+            [v.copy().normalize() for v in vectors1],
+            list(a.copy().normalize()),
+        )
+        self.assertEqual(
+            [v1.reflected(v2) for v1, v2 in zip(vectors1, vectors2)],
+            list(a.copy().reflect(b)),
+        )
+        self.assertEqual(Vec3(), Vec3Array([Vec3()]).normalize()[0])
+
+    def test_vec2(self):
+        a = Vec2Array([(1, 2), (3, 4)])
+        self.assertEqual([Vec2(2, 4), Vec2(6, 8)], list(a * 2))
+        self.assertEqual(array("d", [5., 25.]), a.length_squared())
+        self.assertEqual(array("d", [1., 3.]), a.x)
+
+    def test_numpy(self):
+        if not HAS_NUMPY:
+            self.skipTest("numpy not installed")
+        a = Vec3Array(self.create_vectors())
+        arr = a.to_numpy()
+        self.assertEqual((10, 3), arr.shape)
+        self.assertEqual(a, Vec3Array.from_numpy(arr))
@@ -0,0 +1,55 @@
+import random
+import unittest
+from unittest import TestCase
+
+from src.vec import *
+from src.objects import *
+from src.objects.vectorized import HAS_NUMPY, distance_object_array, to_array
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestVectorized(TestCase):
+
+    @staticmethod
+    def create_scene():
+        sphere = Sphere(material=Color((1, 0, 0)))
+        return Union([
+            Difference([
+                sphere,
+                Sphere(.7).translate((0, .5, -.5)),
+                Tube(.3, axis=2),
+            ]),
+            Intersection([
+                Sphere(.8).scale(1.5),
+                Plane((0, -1, 0)),
+            ]).translate((2.5, 0, 0)),
+            Plane((0, 1, 0)).translate((0, -2, 0)),
+        ])
+
+    def test_distance_object(self):
+        scene = self.create_scene()
+        rnd = random.Random(23)
+        points = [Vec3(rnd.uniform(-4, 4), rnd.uniform(-4, 4), rnd.uniform(-4, 4)) for _ in range(200)]
+
+        for ignore_objects in (None, {scene.nodes[0].nodes[0]}, {scene.nodes[1]}):
+            distances, indices, table = distance_object_array(
+                scene, to_array(points), ignore_objects=ignore_objects,
+            )
+            for i, point in enumerate(points):
+                d, o = scene.distance_object(point, ignore_objects=ignore_objects)
+                self.assertAlmostEqual(d, distances[i], places=9)
+                self.assertIs(o, table[int(indices[i])])
+
+    def test_raymarch_many(self):
+        scene = self.create_scene()
+        origins = [Vec3(x * .3, y * .3, -5) for y in range(-8, 9) for x in range(-8, 12)]
+        directions = [Vec3(0, 0, 1)] * len(origins)
+
+        positions1, objects1, iterations1 = scene.raymarch_many(origins, directions, max_iter=200)
+        positions2, objects2, iterations2 = scene.raymarch_many(
+            origins, directions, max_iter=200, vectorized=True,
+        )
+        for p1, p2 in zip(positions1, positions2):
+            self.assertLess(p1.distance(p2), 1e-9)
+        self.assertEqual(objects1, objects2)
+        self.assertEqual(iterations1, iterations2)